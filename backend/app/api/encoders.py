@@ -0,0 +1,61 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import orjson
+import pandas as pd
+
+_NUMPY = orjson.OPT_SERIALIZE_NUMPY
+
+SERIES_BINARY_MEDIA_TYPE = "application/x-itrade-series"
+
+
+def isoformat_array(dates: pd.Series) -> np.ndarray:
+    # Same text as datetime.isoformat(): fractional seconds only when non-zero.
+    ticks = pd.to_datetime(dates).to_numpy(dtype="datetime64[us]")
+    seconds = np.datetime_as_string(ticks, unit="s")
+    has_fraction = ticks.view(np.int64) % 1_000_000 != 0
+    if has_fraction.any():
+        seconds = np.where(has_fraction, np.datetime_as_string(ticks, unit="us"), seconds)
+    return seconds.astype("S")
+
+
+def float_array(values: pd.Series) -> List[bytes]:
+    encoded = orjson.dumps(np.ascontiguousarray(values.to_numpy(dtype=np.float64)), option=_NUMPY)
+    return encoded[1:-1].split(b",")
+
+
+def encode_points(dates: pd.Series, values: pd.Series) -> bytes:
+    if len(dates) == 0:
+        return b"[]"
+    # Both columns are formatted in bulk; only the final byte-splice is per row.
+    pairs = zip(isoformat_array(dates).tolist(), float_array(values))
+    return b"[" + b",".join([b'{"date":"%s","value":%s}' % pair for pair in pairs]) + b"]"
+
+
+def encode_with_points(payload: Dict[str, Any], key: str, dates: pd.Series, values: pd.Series) -> bytes:
+    head = orjson.dumps(payload, option=_NUMPY)
+    if len(head) > 2:
+        head = head[:-1] + b","
+    else:
+        head = b"{"
+    return head + b'"' + key.encode() + b'":' + encode_points(dates, values) + b"}"
+
+
+def epoch_ms_array(dates: pd.Series) -> np.ndarray:
+    return np.ascontiguousarray(pd.to_datetime(dates).to_numpy(dtype="datetime64[ms]").view(np.int64))
+
+
+def encode_columnar(payload: Dict[str, Any], dates: pd.Series, values: pd.Series) -> bytes:
+    return orjson.dumps(
+        {
+            **payload,
+            "dates": epoch_ms_array(dates),
+            "values": np.ascontiguousarray(values.to_numpy(dtype=np.float64)),
+        },
+        option=_NUMPY,
+    )
+
+
+def encode_binary(dates: pd.Series, values: pd.Series) -> bytes:
+    # n little-endian int64 epoch milliseconds followed by n little-endian float64 values.
+    return epoch_ms_array(dates).astype("<i8").tobytes() + values.to_numpy(dtype="<f8").tobytes()
@@ -0,0 +1,138 @@
+import logging
+import time
+from pathlib import Path
+
+import orjson
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import SamplingProfiler, current_profile, profile_filename
+from app.core.security import user_from_token
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "itrade_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = 0
+
+
+def _in_progress():
+    return [({}, HTTP_REQUESTS_IN_PROGRESS)]
+
+
+registry.callback("itrade_http_requests_in_progress", "HTTP requests currently being handled.", "gauge", _in_progress)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global HTTP_REQUESTS_IN_PROGRESS
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS -= 1
+            # The router stores the matched route in the scope; label by its
+            # template so /indicators/{indicator_code}/data is one series.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status_code),
+            )
+
+
+def _is_superuser(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user = user_from_token(token)
+    except HTTPException:
+        return False
+    return bool(user and user.is_active and user.is_superuser)
+
+
+class ProfilingMiddleware:
+    # Samples one request when it carries "X-Profile: 1" or "?profile=1" and a
+    # superuser bearer token; other requests pass straight through.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _requested(self, scope: Scope) -> bool:
+        if Headers(scope=scope).get("x-profile", "").lower() in ("1", "true"):
+            return True
+        return QueryParams(scope.get("query_string", b"")).get("profile", "").lower() in ("1", "true")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        authorization = Headers(scope=scope).get("authorization", "")
+        if not await run_in_threadpool(_is_superuser, authorization):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(interval=settings.profile_interval)
+        path = (Path(settings.profile_dir) / profile_filename(scope["method"], scope["path"])).resolve()
+        stopped = False
+
+        def write_profile():
+            profiler.stop()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(orjson.dumps(profiler.to_speedscope(f"{scope['method']} {scope['path']}")))
+            logger.info(f"Profiled {scope['method']} {scope['path']}: {profiler.sample_count} samples "
+                        f"over {profiler.duration:.3f}s -> {path}")
+
+        async def finish():
+            # Joining the sampler and writing the file both block; keep them
+            # off the event loop.
+            nonlocal stopped
+            if stopped:
+                return
+            stopped = True
+            await run_in_threadpool(write_profile)
+
+        async def send_wrapper(message: Message):
+            # Stop at the response head so the profile path can be returned;
+            # for streaming responses this covers work up to the first byte.
+            if message["type"] == "http.response.start":
+                await finish()
+                headers = MutableHeaders(scope=message)
+                headers["X-Profile-Path"] = str(path)
+                headers["X-Profile-Samples"] = str(profiler.sample_count)
+            await send(message)
+
+        token = current_profile.set(profiler)
+        profiler.start()
+        try:
+            # Covers the event loop thread (including any requests interleaved on
+            # it); executor workers running tasks for this request attach themselves.
+            with profiler.track_thread():
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            await finish()
@@ -1,32 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import timedelta
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional
 
 from app.models.db_setup import get_db
 from app.models.database import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.schemas.indicator import (
     IndicatorResponse, IndicatorListResponse, IndicatorDataResponse,
-    IndicatorDataPoint, IndicatorCompareRequest, TrendAnalysisResponse
+    IndicatorCompareRequest, IndicatorAnalyticsRequest, TrendAnalysisResponse
 )
-from app.schemas.alert import AlertCreate, AlertResponse, AlertListResponse, AlertUpdate
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_token, oauth2_scheme
+from app.schemas.alert import AlertCreate, AlertResponse, AlertListResponse, AlertUpdate, AlertTrigger
+from app.core.security import verify_password, get_password_hash, create_access_token, oauth2_scheme, user_from_token
 from app.core.config import settings
+from app.core.executors import EXECUTORS, compute_executor, upstream_executor
+from app.api.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
+from app.api.encoders import SERIES_BINARY_MEDIA_TYPE, encode_binary, encode_columnar, encode_with_points
+from app.services.alignment import alignment_engine
+from app.services.analytics import indicator_analytics
 from app.services.data_fetcher import data_fetcher
 from app.services.indicator_calculator import indicator_calculator
 from app.services.alert_service import alert_service
+from app.services.event_bus import event_bus
+from app.services.refresh_scheduler import refresh_scheduler
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["api"])
 
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    payload = decode_token(token)
-    username = payload.get("sub")
-    if username is None:
-        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    user = db.query(User).filter(User.username == username).first()
+    user = user_from_token(token, db)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     return user
@@ -67,54 +78,122 @@ def get_indicators(db: Session = Depends(get_db)):
 
 
 @router.get("/indicators/{indicator_code}/data", response_model=IndicatorDataResponse)
-def get_indicator_data(indicator_code: str, force_update: bool = False):
-    df = data_fetcher.fetch_indicator_data(indicator_code, force_update=force_update)
+async def get_indicator_data(indicator_code: str, request: Request, force_update: bool = False,
+                             format: str = Query("json", pattern="^(json|columnar|binary)$")):
+    df = await data_fetcher.fetch_indicator_data_async(indicator_code, force_update=force_update)
+    meta = data_fetcher.freshness(indicator_code, df)
     
     if df.empty:
         raise HTTPException(status_code=404, detail="Indicator data not found")
     
-    indicator_info = next((i for i in data_fetcher.get_available_indicators() if i["code"] == indicator_code), None)
-    
-    if "date" in df.columns:
-        data_points = []
-        for _, row in df.iterrows():
-            data_points.append(IndicatorDataPoint(
-                date=row["date"],
-                value=float(row["value"]) if "value" in row else float(row.iloc[1])
-            ))
-        latest_value = float(df["value"].iloc[0]) if "value" in df.columns else float(df.iloc[0, 1])
-        change = indicator_calculator.calculate_change_percent(
-            df["value"].tolist() if "value" in df.columns else df.iloc[:, 1].tolist()
-        )
-    else:
-        data_points = []
-        for i, row in df.iterrows():
-            data_points.append(IndicatorDataPoint(
-                date=row.iloc[0],
-                value=float(row.iloc[1])
-            ))
-        latest_value = float(df.iloc[0, 1])
-        change = indicator_calculator.calculate_change_percent(df.iloc[:, 1].tolist())
-    
-    return IndicatorDataResponse(
-        indicator_code=indicator_code,
-        indicator_name=indicator_info["name"] if indicator_info else indicator_code,
-        unit=indicator_info["unit"] if indicator_info else None,
-        data=data_points,
-        latest_value=latest_value,
-        change_percent=change
-    )
+    indicator_info = data_fetcher.get_indicator_info(indicator_code)
+
+    dates = df["date"] if "date" in df.columns else df.iloc[:, 0]
+    values = df["value"] if "value" in df.columns else df.iloc[:, 1]
+    change = indicator_calculator.calculate_change_percent(values.to_numpy(dtype=float)[-2:])
+
+    payload = {
+        "indicator_code": indicator_code,
+        "indicator_name": indicator_info["name"] if indicator_info else indicator_code,
+        "unit": indicator_info["unit"] if indicator_info else None,
+        "latest_value": float(values.iloc[0]),
+        "change_percent": change,
+        "fetched_at": meta["fetched_at"],
+        "age_seconds": meta["age_seconds"],
+        "is_stale": meta["is_stale"],
+    }
+    if SERIES_BINARY_MEDIA_TYPE in request.headers.get("accept", ""):
+        format = "binary"
+    etag = make_etag([indicator_code, data_fetcher.series_version(indicator_code) or "", format])
+    headers = cache_headers(etag, meta["fetched_at"], vary="Accept")
+    headers["X-Data-Stale"] = "true" if meta["is_stale"] else "false"
+    if meta["age_seconds"] is not None:
+        headers["X-Data-Age"] = str(int(meta["age_seconds"]))
+    if is_not_modified(request, etag, meta["fetched_at"]):
+        return not_modified_response(headers)
+
+    if format == "binary":
+        headers.update({
+            "X-Series-Length": str(len(df)),
+            "X-Latest-Value": repr(payload["latest_value"]),
+            "X-Change-Percent": repr(payload["change_percent"]),
+        })
+        content = await compute_executor.run(encode_binary, dates, values)
+        return Response(content=content, media_type=SERIES_BINARY_MEDIA_TYPE, headers=headers)
+    if format == "columnar":
+        content = await compute_executor.run(encode_columnar, payload, dates, values)
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    # Bypass per-row IndicatorDataPoint validation; IndicatorDataResponse
+    # still documents the (unchanged) response schema.
+    content = await compute_executor.run(encode_with_points, payload, "data", dates, values)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _series_etag(scope: str, codes: List[str], *extra: Optional[str]) -> Optional[str]:
+    versions = [data_fetcher.series_version(code) for code in codes]
+    if not all(versions):
+        return None
+    return make_etag([scope, *codes, *versions, *(e or "" for e in extra)])
+
+
+def _last_fetched(codes: List[str]) -> Optional[datetime]:
+    fetched = [t for t in (data_fetcher.fetched_at(code) for code in codes) if t is not None]
+    return max(fetched) if fetched else None
 
 
 @router.post("/indicators/compare")
-def compare_indicators(request: IndicatorCompareRequest):
-    results = indicator_calculator.compare_indicators(request.codes, request.start_date, request.end_date)
+async def compare_indicators(request: IndicatorCompareRequest, http_request: Request, response: Response):
+    etag_parts = ("compare", request.codes, request.start_date, request.end_date, request.format,
+                  request.freq, request.how, request.fill)
+    etag = _series_etag(*etag_parts)
+    if etag is not None and is_not_modified(http_request, etag):
+        return not_modified_response(cache_headers(etag, _last_fetched(request.codes)))
+
+    # Dominated by storage range reads (and upstream fetches on a cold cache).
+    results = await upstream_executor.run(
+        indicator_calculator.compare_indicators,
+        request.codes, request.start_date, request.end_date, columnar=request.format == "columnar",
+        freq=request.freq, how=request.how, fill=request.fill
+    )
+    etag = _series_etag(*etag_parts)
+    if etag is not None:
+        response.headers.update(cache_headers(etag, _last_fetched(request.codes)))
+    return results
+
+
+@router.post("/indicators/analytics")
+async def indicator_analytics_summary(request: IndicatorAnalyticsRequest, http_request: Request, response: Response):
+    codes = list(dict.fromkeys(request.codes))
+    if len(codes) < 2:
+        raise HTTPException(status_code=422, detail="At least two distinct indicators are required")
+    unknown = [code for code in codes if data_fetcher.get_indicator_info(code) is None]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown indicators: {', '.join(unknown)}")
+    if request.window and request.window < 3:
+        raise HTTPException(status_code=422, detail="window must be 0 or at least 3")
+
+    etag_parts = ("analytics", codes, request.start_date, request.end_date, request.freq, request.how, request.fill,
+                  request.method, str(request.max_lag), str(request.window))
+    etag = _series_etag(*etag_parts)
+    if etag is not None and is_not_modified(http_request, etag):
+        return not_modified_response(cache_headers(etag, _last_fetched(codes)))
+
+    block = await upstream_executor.run(
+        alignment_engine.aligned, codes, request.freq, request.start_date, request.end_date, request.how, request.fill
+    )
+    results = await compute_executor.run(
+        indicator_analytics.analyze, block, request.method, request.max_lag, request.window
+    )
+    etag = _series_etag(*etag_parts)
+    if etag is not None:
+        response.headers.update(cache_headers(etag, _last_fetched(codes)))
     return results
 
 
 @router.get("/indicators/{indicator_code}/trend", response_model=TrendAnalysisResponse)
-def get_indicator_trend(indicator_code: str):
-    trend_data = indicator_calculator.get_indicator_trend(indicator_code)
+async def get_indicator_trend(indicator_code: str):
+    trend_data = await indicator_calculator.get_indicator_trend_async(indicator_code)
     return TrendAnalysisResponse(
         indicator_code=trend_data["indicator_code"],
         trend=trend_data["trend"],
@@ -136,9 +215,9 @@ def get_alerts(db: Session = Depends(get_db), current_user: User = Depends(get_c
     return {"total": len(alerts), "items": alerts}
 
 
-@router.get("/alerts/check")
-def check_alerts(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return alert_service.check_alerts(db, current_user.id)
+@router.get("/alerts/check", response_model=List[AlertTrigger])
+def check_alerts(since: Optional[datetime] = None, limit: int = 100, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return alert_service.get_alert_events(db, current_user.id, since, limit)
 
 
 @router.put("/alerts/{alert_id}", response_model=AlertResponse)
@@ -163,26 +242,83 @@ def delete_alert(alert_id: int, db: Session = Depends(get_db), current_user: Use
     return {"message": "Alert deleted successfully"}
 
 
+@router.get("/cache/stats")
+def get_cache_stats():
+    return data_fetcher.cache_stats()
+
+
+@router.get("/refresh/status")
+def get_refresh_status():
+    return {"running": refresh_scheduler.running, "items": refresh_scheduler.get_status()}
+
+
+@router.get("/executors/stats")
+async def get_executor_stats():
+    return {"items": [executor.stats() for executor in EXECUTORS]}
+
+
+@router.get("/stream")
+async def stream_events(request: Request, token: Optional[str] = None):
+    # EventSource cannot set headers, so the bearer token comes as a query
+    # parameter. Without one only public indicator updates are delivered.
+    user = await run_in_threadpool(user_from_token, token)
+    if token and user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    subscription = event_bus.subscribe(user.id if user else None)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.sse_keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {orjson.dumps(event).decode()}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # identity keeps GZipMiddleware from buffering the stream.
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity", "X-Accel-Buffering": "no"},
+    )
+
+
+DASHBOARD_INDICATORS = ["gdp", "cpi", "pmi", "ppi", "rate", "erp"]
+
+
+async def _build_summary_item(code: str) -> dict:
+    try:
+        trend = await indicator_calculator.get_indicator_trend_async(code)
+    except Exception as e:
+        # One failing indicator should not take the rest of the dashboard down.
+        logger.warning(f"Dashboard summary for {code} failed: {e}")
+        trend = {"trend": "no_data"}
+    indicator_info = data_fetcher.get_indicator_info(code)
+
+    return {
+        "code": code,
+        "name": indicator_info["name"] if indicator_info else code,
+        "value": trend.get("latest_value"),
+        "change": trend.get("change_percent"),
+        "trend": trend.get("trend"),
+        "unit": indicator_info["unit"] if indicator_info else None,
+        "latest_date": trend.get("latest_date")
+    }
+
+
 @router.get("/dashboard/summary")
-def get_dashboard_summary():
-    indicators = ["gdp", "cpi", "pmi", "ppi", "rate", "erp"]
-    summary = []
-    for code in indicators:
-        df = data_fetcher.fetch_indicator_data(code)
-        trend = indicator_calculator.get_indicator_trend(code)
-        indicator_info = next((i for i in data_fetcher.get_available_indicators() if i["code"] == code), None)
-        
-        latest_date = None
-        if not df.empty and "date" in df.columns:
-            latest_date = df["date"].iloc[0].strftime("%Y-%m-%d") if hasattr(df["date"].iloc[0], 'strftime') else str(df["date"].iloc[0])[:10]
-        
-        summary.append({
-            "code": code,
-            "name": indicator_info["name"] if indicator_info else code,
-            "value": trend.get("latest_value"),
-            "change": trend.get("change_percent"),
-            "trend": trend.get("trend"),
-            "unit": indicator_info["unit"] if indicator_info else None,
-            "latest_date": latest_date
-        })
+async def get_dashboard_summary(request: Request, response: Response):
+    etag = _series_etag("dashboard", DASHBOARD_INDICATORS)
+    if etag is not None and is_not_modified(request, etag, _last_fetched(DASHBOARD_INDICATORS)):
+        return not_modified_response(cache_headers(etag, _last_fetched(DASHBOARD_INDICATORS)))
+
+    # Concurrency is bounded by the upstream executor's worker count.
+    summary = await asyncio.gather(*(_build_summary_item(code) for code in DASHBOARD_INDICATORS))
+    etag = _series_etag("dashboard", DASHBOARD_INDICATORS)
+    if etag is not None:
+        response.headers.update(cache_headers(etag, _last_fetched(DASHBOARD_INDICATORS)))
     return summary
@@ -17,8 +17,44 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list = ["http://localhost:5173", "http://localhost:3000"]
     
+    # Responses smaller than this (bytes) are sent uncompressed
+    gzip_minimum_size: int = 1024
+
     # Data cache
     cache_ttl: int = 300  # 5 minutes
+    cache_max_entries: int = 64
+    cache_format: str = "sql"  # "sql" (indicator_data table), "npy" (memory-mapped columns) or "json"
+    # Aligned multi-indicator blocks (keyed by series versions, so the TTL only bounds memory)
+    alignment_cache_ttl: int = 3600
+    alignment_cache_max_entries: int = 32
+
+    # Worker threads for blocking upstream/storage I/O and for CPU-bound analytics
+    upstream_workers: int = 8
+    compute_workers: int = 4
+
+    # Background refresh (seconds)
+    refresh_enabled: bool = True
+    refresh_interval_daily: int = 60 * 60
+    refresh_interval_monthly: int = 6 * 60 * 60
+    refresh_interval_quarterly: int = 12 * 60 * 60
+    refresh_initial_delay: int = 30
+    refresh_jitter: float = 0.1  # fraction of the interval
+    refresh_backoff_base: int = 60
+    refresh_backoff_max: int = 60 * 60
+    # Minimum gap between stale-while-revalidate attempts for one indicator
+    revalidate_retry_interval: int = 60
+
+    # Prometheus metrics at /metrics and per-route request timing
+    metrics_enabled: bool = True
+
+    # Per-request sampling profiler for superusers (X-Profile: 1 or ?profile=1)
+    profiling_enabled: bool = False
+    profile_interval: float = 0.005
+    profile_dir: str = "./data/profiles"
+
+    # Server-sent events
+    sse_keepalive: int = 15
+    sse_queue_size: int = 100
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import run_tracked
+
+T = TypeVar("T")
+
+
+class InstrumentedExecutor:
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        context = contextvars.copy_context()
+        return self._executor.submit(self._run, submitted, context.run, partial(fn, *args, **kwargs))
+
+    def _run(self, submitted: float, run: Callable, call: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_seconds_total += started - submitted
+        failed = False
+        try:
+            return run(run_tracked, call)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.failed += failed
+                self.run_seconds_total += time.perf_counter() - started
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "max_queue_depth": self.max_queue_depth,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "run_seconds_total": round(self.run_seconds_total, 6),
+            }
+
+
+# Blocking network and storage I/O (akshare, cache reads and writes).
+upstream_executor = InstrumentedExecutor("upstream", settings.upstream_workers)
+# CPU-bound pandas/NumPy work (trend analytics, serialization).
+compute_executor = InstrumentedExecutor("compute", settings.compute_workers)
+
+EXECUTORS = [upstream_executor, compute_executor]
+
+
+def _executor_samples(field: str):
+    return lambda: [({"executor": executor.name}, executor.stats()[field]) for executor in EXECUTORS]
+
+
+registry.callback("itrade_executor_queue_depth", "Tasks waiting for a worker.", "gauge", _executor_samples("queue_depth"))
+registry.callback("itrade_executor_active", "Tasks currently running.", "gauge", _executor_samples("active"))
+registry.callback("itrade_executor_completed", "Tasks finished.", "counter", _executor_samples("completed"))
+registry.callback("itrade_executor_failed", "Tasks that raised.", "counter", _executor_samples("failed"))
+registry.callback("itrade_executor_wait_seconds", "Time tasks spent queued.", "counter", _executor_samples("wait_seconds_total"))
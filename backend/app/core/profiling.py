@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+FrameKey = Tuple[str, str, int]
+
+# Set for the duration of a profiled request; executors copy the context into
+# their workers, so tasks submitted on its behalf are sampled as well.
+current_profile: "ContextVar[Optional[SamplingProfiler]]" = ContextVar("current_profile", default=None)
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._frames: Dict[FrameKey, int] = {}
+        self._samples: "Counter[Tuple[int, ...]]" = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    @contextmanager
+    def track_thread(self) -> Iterator[None]:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                idents = list(self._threads)
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._samples[self._stack(frame)] += 1
+
+    def _stack(self, frame) -> Tuple[int, ...]:
+        stack: List[int] = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            index = self._frames.get(key)
+            if index is None:
+                index = self._frames[key] = len(self._frames)
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self._samples.values())
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        frames = sorted(self._frames.items(), key=lambda item: item[1])
+        stacks = list(self._samples.items())
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "itrade",
+            "shared": {
+                "frames": [{"name": func, "file": file, "line": line} for (func, file, line), _ in frames],
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(self.duration, 6),
+                "samples": [list(stack) for stack, _ in stacks],
+                "weights": [count * self.interval for _, count in stacks],
+            }],
+        }
+
+
+def run_tracked(call: Callable[[], T]) -> T:
+    # Must run inside the submitting task's context (see current_profile).
+    profile = current_profile.get()
+    if profile is None:
+        return call()
+    with profile.track_thread():
+        return call()
+
+
+def profile_filename(method: str, path: str) -> str:
+    slug = "".join(c if c.isalnum() else "_" for c in path.strip("/")) or "root"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}-{method.lower()}-{slug[:80]}.speedscope.json"
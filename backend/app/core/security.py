@@ -5,7 +5,10 @@ from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
+from sqlalchemy.orm import Session
 from .config import settings
+from ..models.database import User
+from ..models.db_setup import SessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -43,3 +46,17 @@ def decode_token(token: str) -> dict:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def user_from_token(token: Optional[str], db: Optional[Session] = None) -> Optional[User]:
+    # Raises like decode_token on a bad token; returns None without a token or
+    # a known user. Opens its own session unless one is passed.
+    if not token:
+        return None
+    username = decode_token(token).get("sub")
+    if username is None:
+        return None
+    if db is not None:
+        return db.query(User).filter(User.username == username).first()
+    with SessionLocal() as db:
+        return db.query(User).filter(User.username == username).first()
@@ -1,20 +1,38 @@
+import asyncio
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, registry
 from app.models.db_setup import init_db
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
 from app.api.routes import router
+from app.services.alert_service import alert_service
+from app.services.data_fetcher import data_fetcher
+from app.services.event_bus import event_bus
+from app.services.indicator_calculator import indicator_calculator
+from app.services.refresh_scheduler import refresh_scheduler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    data_fetcher.register_indicators()
+    data_fetcher.add_listener(alert_service.on_series_updated)
+    data_fetcher.add_listener(event_bus.on_series_updated)
+    data_fetcher.add_listener(indicator_calculator.on_series_updated)
+    event_bus.bind(asyncio.get_running_loop())
+    if settings.refresh_enabled:
+        await refresh_scheduler.start()
     yield
+    await refresh_scheduler.stop()
+    event_bus.unbind()
 
 
 app = FastAPI(
@@ -31,11 +49,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(router)
 
 
 @app.get("/")
-def root():
+async def root():
     return {
         "name": settings.app_name,
         "version": settings.app_version,
@@ -44,5 +70,10 @@ def root():
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -45,6 +45,10 @@ class IndicatorData(Base):
     value = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_indicator_data_code_date", "indicator_code", "date", unique=True),
+    )
+
 
 class Alert(Base):
     __tablename__ = "alerts"
@@ -60,6 +64,28 @@ class Alert(Base):
 
     user = relationship("User", back_populates="alerts")
 
+    __table_args__ = (
+        Index("ix_alerts_indicator_active", "indicator_code", "is_active"),
+    )
+
+
+class AlertEvent(Base):
+    __tablename__ = "alert_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, ForeignKey("alerts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    indicator_code = Column(String, nullable=False)
+    condition = Column(String, nullable=False)
+    threshold = Column(Float, nullable=False)
+    current_value = Column(Float, nullable=False)
+    data_date = Column(DateTime)
+    triggered_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_alert_events_user_triggered", "user_id", "triggered_at"),
+    )
+
 
 class FavoriteIndicator(Base):
     __tablename__ = "favorite_indicators"
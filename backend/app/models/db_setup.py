@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from .database import Base
+from .database import Alert, Base, IndicatorData
 from ..core.config import settings
+from ..core.metrics import registry
 
 engine = create_engine(
     settings.database_url, 
@@ -9,9 +12,56 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+DB_QUERY_SECONDS = registry.histogram("itrade_db_query_duration_seconds", "SQL statement latency.", ["operation"])
+DB_QUERY_ERRORS = registry.counter("itrade_db_query_errors", "SQL statements that raised.", ["operation"])
+DB_TRANSACTION_SECONDS = registry.histogram(
+    "itrade_db_transaction_duration_seconds", "Time from a session's first statement to commit or rollback."
+)
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "PRAGMA"}
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in SQL_OPERATIONS else "OTHER"
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    DB_QUERY_SECONDS.observe(time.perf_counter() - started, operation=_operation(statement))
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+    DB_QUERY_ERRORS.inc(operation=_operation(context.statement or ""))
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _after_begin(session, transaction, connection):
+    session.info.setdefault("transaction_started", time.perf_counter())
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None and "transaction_started" in session.info:
+        DB_TRANSACTION_SECONDS.observe(time.perf_counter() - session.info.pop("transaction_started"))
+
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so make sure indexes added
+    # to existing tables are created as well.
+    for table in (IndicatorData.__table__, Alert.__table__):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 def get_db():
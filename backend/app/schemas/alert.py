@@ -36,9 +36,14 @@ class AlertListResponse(BaseModel):
 
 
 class AlertTrigger(BaseModel):
+    id: int
     alert_id: int
     indicator_code: str
     current_value: float
     condition: str
     threshold: float
+    data_date: Optional[datetime] = None
     triggered_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -32,6 +32,9 @@ class IndicatorDataResponse(BaseModel):
     data: List[IndicatorDataPoint]
     latest_value: Optional[float]
     change_percent: Optional[float]
+    fetched_at: Optional[datetime] = None
+    age_seconds: Optional[float] = None
+    is_stale: bool = False
 
 
 class IndicatorListResponse(BaseModel):
@@ -43,6 +46,24 @@ class IndicatorCompareRequest(BaseModel):
     codes: List[str]
     start_date: Optional[str] = None
     end_date: Optional[str] = None
+    format: str = Field("json", pattern="^(json|columnar)$")
+    # When set, series are aligned onto one period grid instead of native dates.
+    freq: Optional[str] = Field(None, pattern="^(D|W|M|Q|Y)$")
+    how: str = Field("last", pattern="^(last|mean)$")
+    fill: str = Field("drop", pattern="^(drop|ffill|keep)$")
+
+
+class IndicatorAnalyticsRequest(BaseModel):
+    codes: List[str] = Field(..., min_length=2, max_length=10)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    freq: str = Field("M", pattern="^(D|W|M|Q|Y)$")
+    how: str = Field("last", pattern="^(last|mean)$")
+    fill: str = Field("drop", pattern="^(drop|ffill)$")
+    method: str = Field("pearson", pattern="^(pearson|spearman)$")
+    max_lag: int = Field(6, ge=0, le=36)
+    # Trailing window (in periods) for rolling Pearson correlations; 0 disables them.
+    window: int = Field(12, ge=0, le=520)
 
 
 class TrendAnalysisResponse(BaseModel):
@@ -0,0 +1,120 @@
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (alert_id, user_id, condition, threshold)
+AlertRow = Tuple[int, int, str, float]
+
+
+class SortedThresholds:
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.alert_ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def add(self, threshold: float, alert_id: int):
+        i = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.alert_ids.insert(i, alert_id)
+
+    def remove(self, threshold: float, alert_id: int) -> bool:
+        i = bisect_left(self.thresholds, threshold)
+        j = bisect_right(self.thresholds, threshold)
+        for k in range(i, j):
+            if self.alert_ids[k] == alert_id:
+                del self.thresholds[k]
+                del self.alert_ids[k]
+                return True
+        return False
+
+    def ids_between(self, lo: int, hi: int) -> List[int]:
+        return self.alert_ids[lo:hi] if lo < hi else []
+
+
+class IndicatorAlertIndex:
+    def __init__(self, equals_tolerance: float):
+        self.equals_tolerance = equals_tolerance
+        self.by_condition: Dict[str, SortedThresholds] = {
+            "above": SortedThresholds(),
+            "below": SortedThresholds(),
+            "equals": SortedThresholds(),
+        }
+        self.alerts: Dict[int, AlertRow] = {}
+
+    def add(self, row: AlertRow):
+        alert_id, _, condition, threshold = row
+        self.remove(alert_id)
+        if condition not in self.by_condition:
+            return
+        self.by_condition[condition].add(threshold, alert_id)
+        self.alerts[alert_id] = row
+
+    def remove(self, alert_id: int):
+        row = self.alerts.pop(alert_id, None)
+        if row is not None:
+            self.by_condition[row[2]].remove(row[3], alert_id)
+
+    def crossed(self, previous: Optional[float], current: float) -> List[AlertRow]:
+        # Alerts whose condition holds for `current` but did not hold for
+        # `previous`; every alert that holds counts when there is no previous value.
+        above = self.by_condition["above"]
+        below = self.by_condition["below"]
+        equals = self.by_condition["equals"]
+
+        # above: previous <= threshold < current
+        hi = bisect_left(above.thresholds, current)
+        lo = 0 if previous is None else bisect_left(above.thresholds, previous)
+        ids = above.ids_between(lo, hi)
+
+        # below: current < threshold <= previous
+        lo = bisect_right(below.thresholds, current)
+        hi = len(below) if previous is None else bisect_right(below.thresholds, previous)
+        ids += below.ids_between(lo, hi)
+
+        # equals: |current - threshold| < tol and not |previous - threshold| < tol
+        tol = self.equals_tolerance
+        lo = bisect_right(equals.thresholds, current - tol)
+        hi = bisect_left(equals.thresholds, current + tol)
+        for k in range(lo, hi):
+            if previous is None or abs(previous - equals.thresholds[k]) >= tol:
+                ids.append(equals.alert_ids[k])
+
+        return [self.alerts[alert_id] for alert_id in ids]
+
+
+class AlertIndex:
+    def __init__(self, loader: Callable[[str], Iterable[AlertRow]], equals_tolerance: float):
+        self.loader = loader
+        self.equals_tolerance = equals_tolerance
+        self._indexes: Dict[str, IndicatorAlertIndex] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, indicator_code: str) -> IndicatorAlertIndex:
+        index = self._indexes.get(indicator_code)
+        if index is None:
+            index = IndicatorAlertIndex(self.equals_tolerance)
+            for row in self.loader(indicator_code):
+                index.add(row)
+            self._indexes[indicator_code] = index
+        return index
+
+    def upsert(self, indicator_code: str, row: AlertRow):
+        with self._lock:
+            # Unloaded indicators pick the alert up from the database on first use.
+            if indicator_code in self._indexes:
+                self._indexes[indicator_code].add(row)
+
+    def remove(self, indicator_code: str, alert_id: int):
+        with self._lock:
+            if indicator_code in self._indexes:
+                self._indexes[indicator_code].remove(alert_id)
+
+    def crossed(self, indicator_code: str, previous: Optional[float], current: float) -> List[AlertRow]:
+        with self._lock:
+            return self._get(indicator_code).crossed(previous, current)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
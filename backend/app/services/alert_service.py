@@ -1,11 +1,49 @@
-from typing import List, Optional
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from datetime import datetime
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from ..models.database import Alert
-from ..services.data_fetcher import data_fetcher
+from ..core.metrics import registry
+from ..models.database import Alert, AlertEvent
+from ..models.db_setup import SessionLocal
+from ..services.alert_index import AlertIndex, AlertRow
+from ..services.data_fetcher import SeriesUpdate, data_fetcher
+from ..services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+EQUALS_TOLERANCE = 0.01
+UPDATE_CHUNK_SIZE = 500
+
+ALERT_EVALUATION_SECONDS = registry.histogram(
+    "itrade_alert_evaluation_duration_seconds", "Alert evaluation latency.", ["trigger"]
+)
+ALERTS_TRIGGERED = registry.counter("itrade_alerts_triggered", "Alert events recorded.", ["trigger"])
+
+
+def latest_point(df: Optional[pd.DataFrame]) -> Optional[Tuple[Optional[datetime], float]]:
+    if df is None or df.empty or "value" not in df.columns:
+        return None
+    if "date" not in df.columns:
+        return None, float(df["value"].iloc[0])
+    pos = int(pd.to_datetime(df["date"]).to_numpy().argmax())
+    return pd.Timestamp(df["date"].iloc[pos]).to_pydatetime(), float(df["value"].iloc[pos])
+
+
+def alert_row(alert: Alert) -> AlertRow:
+    return alert.id, alert.user_id, alert.condition, alert.threshold
 
 
 class AlertService:
+    def __init__(self):
+        # A single worker keeps evaluations of one indicator in arrival order.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-eval")
+        self.index = AlertIndex(self._load_active_alerts, EQUALS_TOLERANCE)
+
     def create_alert(self, db: Session, user_id: int, indicator_code: str, condition: str, threshold: float) -> Alert:
         alert = Alert(
             user_id=user_id,
@@ -17,6 +55,8 @@ class AlertService:
         db.add(alert)
         db.commit()
         db.refresh(alert)
+        self.index.upsert(alert.indicator_code, alert_row(alert))
+        self.evaluate_alert(db, alert)
         return alert
 
     def get_user_alerts(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Alert]:
@@ -28,56 +68,140 @@ class AlertService:
     def update_alert(self, db: Session, alert_id: int, user_id: int, **kwargs) -> Optional[Alert]:
         alert = self.get_alert(db, alert_id, user_id)
         if alert:
+            before = (alert.condition, alert.threshold, alert.is_active)
             for key, value in kwargs.items():
                 if hasattr(alert, key) and value is not None:
                     setattr(alert, key, value)
             db.commit()
             db.refresh(alert)
+            if alert.is_active:
+                self.index.upsert(alert.indicator_code, alert_row(alert))
+            else:
+                self.index.remove(alert.indicator_code, alert.id)
+            if (alert.condition, alert.threshold, alert.is_active) != before:
+                self.evaluate_alert(db, alert)
+                db.refresh(alert)
         return alert
 
     def delete_alert(self, db: Session, alert_id: int, user_id: int) -> bool:
         alert = self.get_alert(db, alert_id, user_id)
         if alert:
+            db.query(AlertEvent).filter(AlertEvent.alert_id == alert.id).delete(synchronize_session=False)
             db.delete(alert)
             db.commit()
+            self.index.remove(alert.indicator_code, alert.id)
             return True
         return False
 
-    def check_alerts(self, db: Session, user_id: int) -> List[dict]:
-        alerts = db.query(Alert).filter(Alert.user_id == user_id, Alert.is_active == True).all()
-        triggered = []
+    def evaluate_thresholds(self, conditions: np.ndarray, thresholds: np.ndarray, value: float) -> np.ndarray:
+        triggered = np.zeros(len(thresholds), dtype=bool)
+        above = conditions == "above"
+        triggered[above] = value > thresholds[above]
+        below = conditions == "below"
+        triggered[below] = value < thresholds[below]
+        equals = conditions == "equals"
+        triggered[equals] = np.abs(value - thresholds[equals]) < EQUALS_TOLERANCE
+        return triggered
+
+    def get_alert_events(self, db: Session, user_id: int, since: Optional[datetime] = None, limit: int = 100) -> List[AlertEvent]:
+        query = db.query(AlertEvent).filter(AlertEvent.user_id == user_id)
+        if since is not None:
+            query = query.filter(AlertEvent.triggered_at > since)
+        return query.order_by(AlertEvent.triggered_at.desc()).limit(limit).all()
 
-        for alert in alerts:
-            df = data_fetcher.fetch_indicator_data(alert.indicator_code, force_update=True)
-            if df.empty:
-                continue
+    def evaluate_alert(self, db: Session, alert: Alert) -> int:
+        with ALERT_EVALUATION_SECONDS.time(trigger="alert_change"):
+            count = self._evaluate_alert(db, alert)
+        ALERTS_TRIGGERED.inc(count, trigger="alert_change")
+        return count
 
-            if "value" in df.columns:
-                current_value = float(df["value"].iloc[-1])
-            else:
-                continue
-
-            is_triggered = False
-            if alert.condition == "above" and current_value > alert.threshold:
-                is_triggered = True
-            elif alert.condition == "below" and current_value < alert.threshold:
-                is_triggered = True
-            elif alert.condition == "equals" and abs(current_value - alert.threshold) < 0.01:
-                is_triggered = True
-
-            if is_triggered:
-                alert.last_triggered = datetime.utcnow()
-                db.commit()
-                triggered.append({
-                    "alert_id": alert.id,
-                    "indicator_code": alert.indicator_code,
-                    "condition": alert.condition,
-                    "threshold": alert.threshold,
-                    "current_value": current_value,
-                    "triggered_at": alert.last_triggered
-                })
+    def _evaluate_alert(self, db: Session, alert: Alert) -> int:
+        # Only already-stored data is used: if the series has never been
+        # fetched, the first fetch evaluates this alert through on_series_updated.
+        point = latest_point(data_fetcher.get_cached(alert.indicator_code))
+        if point is None or not alert.is_active:
+            return 0
+        data_date, value = point
+        mask = self.evaluate_thresholds(np.array([alert.condition]), np.array([alert.threshold], dtype=float), value)
+        if not mask[0]:
+            return 0
+        return self._record_events(db, alert.indicator_code, data_date, value,
+                                   [alert.id], [alert.user_id], [alert.condition], [alert.threshold])
 
-        return triggered
+    def evaluate_indicator(self, db: Session, indicator_code: str, previous: Optional[pd.DataFrame],
+                           df: pd.DataFrame) -> int:
+        point = latest_point(df)
+        if point is None:
+            return 0
+        data_date, value = point
+        previous_point = latest_point(previous)
+        previous_value = previous_point[1] if previous_point is not None else None
+
+        rows = self.index.crossed(indicator_code, previous_value, value)
+        if not rows:
+            return 0
+        alert_ids, user_ids, conditions, thresholds = (list(column) for column in zip(*rows))
+        return self._record_events(db, indicator_code, data_date, value, alert_ids, user_ids, conditions, thresholds)
+
+    def _load_active_alerts(self, indicator_code: str) -> List[AlertRow]:
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(Alert.id, Alert.user_id, Alert.condition, Alert.threshold)
+                .where(Alert.indicator_code == indicator_code, Alert.is_active == True)
+            ).all()
+        return [tuple(row) for row in rows]
+
+    def _record_events(self, db: Session, indicator_code: str, data_date: Optional[datetime], value: float,
+                       alert_ids: List[int], user_ids: List[int], conditions: List[str], thresholds: List[float]) -> int:
+        triggered_at = datetime.utcnow()
+        db.execute(insert(AlertEvent), [
+            {
+                "alert_id": alert_id,
+                "user_id": user_id,
+                "indicator_code": indicator_code,
+                "condition": condition,
+                "threshold": threshold,
+                "current_value": value,
+                "data_date": data_date,
+                "triggered_at": triggered_at,
+            }
+            for alert_id, user_id, condition, threshold in zip(alert_ids, user_ids, conditions, thresholds)
+        ])
+        for i in range(0, len(alert_ids), UPDATE_CHUNK_SIZE):
+            db.query(Alert).filter(Alert.id.in_(alert_ids[i:i + UPDATE_CHUNK_SIZE])).update(
+                {Alert.last_triggered: triggered_at}, synchronize_session=False
+            )
+        db.commit()
+
+        for alert_id, user_id, condition, threshold in zip(alert_ids, user_ids, conditions, thresholds):
+            event_bus.publish({
+                "type": "alert_triggered",
+                "alert_id": alert_id,
+                "indicator_code": indicator_code,
+                "condition": condition,
+                "threshold": threshold,
+                "current_value": value,
+                "data_date": data_date.isoformat() if data_date else None,
+                "triggered_at": triggered_at.isoformat(),
+            }, user_id=user_id)
+        return len(alert_ids)
+
+    def on_series_updated(self, indicator_code: str, previous: Optional[pd.DataFrame], df: pd.DataFrame,
+                          update: SeriesUpdate):
+        self._executor.submit(self._evaluate_in_background, indicator_code, previous, df)
+
+    def _evaluate_in_background(self, indicator_code: str, previous: Optional[pd.DataFrame], df: pd.DataFrame):
+        started = time.perf_counter()
+        try:
+            with SessionLocal() as db:
+                count = self.evaluate_indicator(db, indicator_code, previous, df)
+        except Exception as e:
+            logger.error(f"Alert evaluation for {indicator_code} failed: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        ALERT_EVALUATION_SECONDS.observe(elapsed, trigger="series_update")
+        ALERTS_TRIGGERED.inc(count, trigger="series_update")
+        logger.info(f"Evaluated alerts for {indicator_code} in {elapsed:.3f}s, {count} triggered")
 
 
 alert_service = AlertService()
@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.services.cache_storage import filter_date_range
+from app.services.data_fetcher import data_fetcher
+
+# Pandas Period frequencies accepted for alignment.
+FREQUENCIES = {"D": "D", "W": "W", "M": "M", "Q": "Q", "Y": "Y"}
+AGGREGATIONS = ("last", "mean")
+# drop: only periods every series observed; ffill: every period from the
+# latest series start, carrying each series' last observation forward;
+# keep: every period in range, missing values left as NaN.
+FILL_POLICIES = ("drop", "ffill", "keep")
+
+ALIGNMENT_LOOKUPS = registry.counter(
+    "itrade_alignment_lookups", "Aligned blocks served from (hit) or built past (miss) the cache.", ["result"]
+)
+
+
+class AlignedBlock:
+    # Indicator series on one period grid: `values` is (periods, codes),
+    # oldest period first. Blocks are shared through the cache, so the
+    # array is read-only.
+    def __init__(self, codes: List[str], periods: pd.PeriodIndex, values: np.ndarray,
+                 freq: str, how: str, fill: str):
+        self.codes = codes
+        self.periods = periods
+        self.values = values
+        self.values.flags.writeable = False
+        self.freq = freq
+        self.how = how
+        self.fill = fill
+        self.labels: List[str] = periods.astype(str).tolist()
+        self._index = {code: i for i, code in enumerate(codes)}
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def column(self, code: str) -> np.ndarray:
+        return self.values[:, self._index[code]]
+
+    def period_starts(self) -> np.ndarray:
+        return self.periods.start_time.to_numpy(dtype="datetime64[ms]")
+
+    def latest_value(self, code: str) -> Optional[float]:
+        column = self.column(code)
+        present = np.flatnonzero(~np.isnan(column))
+        return float(column[present[-1]]) if len(present) else None
+
+
+def _bucket(df: pd.DataFrame, freq: str, how: str) -> pd.Series:
+    dates = pd.DatetimeIndex(df["date"] if df["date"].dtype.kind == "M" else pd.to_datetime(df["date"]))
+    # Stable date order, so "last" means the latest observation in a period.
+    order = np.argsort(dates.to_numpy(), kind="stable")
+    values = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=float)[order]
+    grouped = pd.Series(values, index=dates[order].to_period(FREQUENCIES[freq])).dropna().groupby(level=0)
+    return grouped.last() if how == "last" else grouped.mean()
+
+
+def align_frames(frames: Dict[str, pd.DataFrame], freq: str = "M", how: str = "last",
+                 fill: str = "drop") -> AlignedBlock:
+    # Series without any usable observation are left out of the block.
+    columns = {code: _bucket(df, freq, how) for code, df in frames.items()}
+    columns = {code: column for code, column in columns.items() if len(column)}
+    codes = list(columns)
+    if not codes:
+        return AlignedBlock(codes, pd.PeriodIndex([], freq=FREQUENCIES[freq]), np.empty((0, 0)), freq, how, fill)
+
+    if fill == "drop":
+        aligned = pd.concat(columns, axis=1, join="inner").dropna()
+    else:
+        aligned = pd.concat(columns, axis=1, join="outer")
+        aligned = aligned.reindex(pd.period_range(aligned.index.min(), aligned.index.max(), freq=FREQUENCIES[freq]))
+        if fill == "ffill":
+            start = max(column.index.min() for column in columns.values())
+            aligned = aligned.ffill().loc[start:]
+    return AlignedBlock(codes, aligned.index, aligned[codes].to_numpy(dtype=float), freq, how, fill)
+
+
+class AlignmentEngine:
+    def __init__(self):
+        # Keys include every series version, so entries never go stale; the
+        # TTL and size bound only limit memory.
+        self.cache = TTLCache(ttl=settings.alignment_cache_ttl, max_entries=settings.alignment_cache_max_entries)
+
+    def _key(self, codes: Tuple[str, ...], versions: Tuple[Optional[str], ...], freq: str, how: str, fill: str,
+             start: Optional[str], end: Optional[str]):
+        if not all(versions):
+            return None
+        return (codes, versions, freq, how, fill, start, end)
+
+    def aligned(self, codes: List[str], freq: str = "M", start_date: Optional[str] = None,
+                end_date: Optional[str] = None, how: str = "last", fill: str = "drop") -> AlignedBlock:
+        codes = tuple(dict.fromkeys(codes))
+        versions = tuple(data_fetcher.series_version(code) for code in codes)
+        key = self._key(codes, versions, freq, how, fill, start_date, end_date)
+        block = self.cache.get(key) if key is not None else None
+        if block is not None:
+            ALIGNMENT_LOOKUPS.inc(result="hit")
+            return block
+        ALIGNMENT_LOOKUPS.inc(result="miss")
+
+        start = pd.to_datetime(start_date).to_pydatetime() if start_date else None
+        end = pd.to_datetime(end_date).to_pydatetime() if end_date else None
+        frames = {}
+        loaded_versions = []
+        for code in codes:
+            df = data_fetcher.fetch_indicator_data(code)
+            loaded_versions.append(data_fetcher.frame_version(code, df))
+            if not df.empty and "date" in df.columns and "value" in df.columns:
+                frames[code] = filter_date_range(df, start, end)
+        block = align_frames(frames, freq, how, fill)
+
+        # Keyed by the versions of the frames actually read, so a refresh
+        # landing mid-build can never be paired with older data.
+        key = self._key(codes, tuple(loaded_versions), freq, how, fill, start_date, end_date)
+        if key is not None:
+            self.cache.set(key, block)
+        return block
+
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+
+
+alignment_engine = AlignmentEngine()
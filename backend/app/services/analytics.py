@@ -0,0 +1,131 @@
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.services.alignment import AlignedBlock
+
+MIN_OBSERVATIONS = 3
+
+
+def _rank(matrix: np.ndarray) -> np.ndarray:
+    # Column-wise ranks with ties averaged, as Spearman needs.
+    ranks = np.empty_like(matrix, dtype=float)
+    for j in range(matrix.shape[1]):
+        _, inverse, counts = np.unique(matrix[:, j], return_inverse=True, return_counts=True)
+        ends = np.cumsum(counts)
+        ranks[:, j] = (ends - (counts - 1) / 2.0)[inverse]
+    return ranks
+
+
+def _standardize(matrix: np.ndarray) -> np.ndarray:
+    centered = matrix - matrix.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return centered / norms
+
+
+def cross_correlation(a: np.ndarray, b: np.ndarray, method: str = "pearson") -> np.ndarray:
+    # C[i, j] = corr(a[:, i], b[:, j]) over rows; NaN where a column is constant.
+    if len(a) < MIN_OBSERVATIONS:
+        return np.full((a.shape[1], b.shape[1]), np.nan)
+    if method == "spearman":
+        a, b = _rank(a), _rank(b)
+    return np.clip(_standardize(a).T @ _standardize(b), -1.0, 1.0)
+
+
+def correlation_matrix(matrix: np.ndarray, method: str = "pearson") -> np.ndarray:
+    result = cross_correlation(matrix, matrix, method)
+    np.fill_diagonal(result, np.where(np.isnan(np.diag(result)), np.nan, 1.0))
+    return result
+
+
+def lagged_correlations(matrix: np.ndarray, max_lag: int, method: str = "pearson") -> np.ndarray:
+    # Returns (2 * max_lag + 1, p, p): entry [k, i, j] is the correlation of
+    # series i at t with series j at t + lag, lag = k - max_lag. A positive
+    # best lag means i leads j.
+    n, p = matrix.shape
+    result = np.full((2 * max_lag + 1, p, p), np.nan)
+    for lag in range(0, min(max_lag, n - 1) + 1):
+        forward = cross_correlation(matrix[:n - lag], matrix[lag:], method)
+        result[max_lag + lag] = forward
+        result[max_lag - lag] = forward.T
+    return result
+
+
+def rolling_correlations(matrix: np.ndarray, window: int, pairs: List[Tuple[int, int]]) -> np.ndarray:
+    # Pearson correlation over each trailing `window` rows, for all pairs at
+    # once from cumulative sums; (n - window + 1, len(pairs)).
+    n = matrix.shape[0]
+    if window < MIN_OBSERVATIONS or n < window or not pairs:
+        return np.empty((0, len(pairs)))
+    # Centering keeps the cumulative sums small relative to the variances.
+    x = matrix - matrix.mean(axis=0)
+    left, right = np.array(pairs).T
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        totals = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+        return totals[window:] - totals[:-window]
+
+    sx, sy = window_sums(x[:, left]), window_sums(x[:, right])
+    sxx, syy = window_sums(x[:, left] ** 2), window_sums(x[:, right] ** 2)
+    sxy = window_sums(x[:, left] * x[:, right])
+    cov = sxy - sx * sy / window
+    var_x = sxx - sx ** 2 / window
+    var_y = syy - sy ** 2 / window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var_x * var_y)
+    # Constant windows leave round-off in the variances; treat them as undefined.
+    scale = (x[:, left] ** 2).max(axis=0) + (x[:, right] ** 2).max(axis=0)
+    corr[(var_x <= 1e-12 * scale) | (var_y <= 1e-12 * scale)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _floats(values: np.ndarray, digits: int = 6) -> List:
+    # JSON-ready list with NaN as null.
+    rounded = np.round(values, digits).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+class IndicatorAnalytics:
+    def analyze(self, block: AlignedBlock, method: str = "pearson", max_lag: int = 6, window: int = 12) -> Dict:
+        codes, labels, matrix = block.codes, block.labels, block.values
+        pairs = list(combinations(range(len(codes)), 2))
+
+        matrix_corr = correlation_matrix(matrix, method)
+        lagged = lagged_correlations(matrix, max_lag, method)
+        lags = list(range(-max_lag, max_lag + 1))
+        lagged_pairs = []
+        for i, j in pairs:
+            values = lagged[:, i, j]
+            best = None
+            if not np.all(np.isnan(values)):
+                k = int(np.nanargmax(np.abs(values)))
+                best = {"lag": lags[k], "value": round(float(values[k]), 6)}
+            lagged_pairs.append({"x": codes[i], "y": codes[j], "values": _floats(values), "best": best})
+
+        rolling = rolling_correlations(matrix, window, pairs) if window else np.empty((0, len(pairs)))
+        return {
+            "codes": codes,
+            "freq": block.freq,
+            "how": block.how,
+            "fill": block.fill,
+            "method": method,
+            "observations": len(labels),
+            "start": labels[0] if labels else None,
+            "end": labels[-1] if labels else None,
+            "correlation": [_floats(row) for row in matrix_corr],
+            "lagged": {"lags": lags, "pairs": lagged_pairs},
+            "rolling": {
+                "window": window,
+                "periods": labels[window - 1:] if len(rolling) else [],
+                "pairs": [
+                    {"x": codes[i], "y": codes[j], "values": _floats(rolling[:, k])}
+                    for k, (i, j) in enumerate(pairs)
+                ],
+            },
+        }
+
+
+indicator_analytics = IndicatorAnalytics()
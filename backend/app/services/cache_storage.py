@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.database import IndicatorData
+from app.models.db_setup import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def filter_date_range(df: pd.DataFrame, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> pd.DataFrame:
+    if start is not None:
+        df = df[df["date"] >= start]
+    if end is not None:
+        df = df[df["date"] <= end]
+    return df
+
+
+class CacheStorage(ABC):
+    suffix = ""
+
+    def __init__(self, cache_dir: Path, legacy: Optional["CacheStorage"] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.legacy = legacy
+
+    def path(self, indicator_code: str) -> Path:
+        return self.cache_dir / f"{indicator_code}_cache{self.suffix}"
+
+    def exists(self, indicator_code: str) -> bool:
+        return self.path(indicator_code).exists()
+
+    def remove(self, indicator_code: str):
+        self.path(indicator_code).unlink(missing_ok=True)
+
+    def fetched_at(self, indicator_code: str) -> Optional[datetime]:
+        path = self.path(indicator_code)
+        if not path.exists():
+            return None
+        return datetime.fromtimestamp(path.stat().st_mtime)
+
+    def load(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        if self.exists(indicator_code):
+            return self._read(indicator_code)
+        if self.legacy is not None:
+            return self._migrate(indicator_code)
+        return None
+
+    def load_range(self, indicator_code: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> pd.DataFrame:
+        df = self.load(indicator_code)
+        if df is None or df.empty:
+            return pd.DataFrame()
+        return filter_date_range(df, start, end)
+
+    @abstractmethod
+    def save(self, indicator_code: str, df: pd.DataFrame):
+        ...
+
+    @abstractmethod
+    def _read(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        ...
+
+    def _migrate(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        df = self.legacy.load(indicator_code)
+        if df is None or df.empty:
+            return df
+        df = df.assign(date=pd.to_datetime(df["date"]))
+        self.save(indicator_code, df)
+        self.legacy.remove(indicator_code)
+        logger.info(f"Migrated {indicator_code} cache from {type(self.legacy).__name__} to {type(self).__name__}")
+        return self._read(indicator_code)
+
+
+class JsonCacheStorage(CacheStorage):
+    suffix = ".json"
+
+    def save(self, indicator_code: str, df: pd.DataFrame):
+        df.to_json(self.path(indicator_code), orient="records", date_format="iso")
+
+    def _read(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        try:
+            return pd.read_json(self.path(indicator_code))
+        except (json.JSONDecodeError, ValueError, pd.errors.EmptyDataError) as e:
+            logger.warning(f"Failed to load cache for {indicator_code}: {e}")
+            return None
+
+
+class NumpyCacheStorage(CacheStorage):
+    # One (2, n) int64 block per series: row 0 holds datetime64[ns] ticks and
+    # row 1 the float64 bit patterns, so both columns load as contiguous,
+    # memory-mapped views without parsing.
+    suffix = ".npy"
+
+    def save(self, indicator_code: str, df: pd.DataFrame):
+        block = np.empty((2, len(df)), dtype=np.int64)
+        block[0] = df["date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        block[1] = df["value"].to_numpy(dtype=np.float64).view(np.int64)
+
+        target = self.path(indicator_code)
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, block, allow_pickle=False)
+        os.replace(tmp, target)
+
+    def _read(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        try:
+            block = np.load(self.path(indicator_code), mmap_mode="r", allow_pickle=False)
+        except (ValueError, OSError) as e:
+            logger.warning(f"Failed to load cache for {indicator_code}: {e}")
+            return None
+        if block.ndim != 2 or block.shape[0] != 2 or block.dtype != np.int64:
+            logger.warning(f"Unexpected cache layout for {indicator_code}: {block.shape} {block.dtype}")
+            return None
+        return pd.DataFrame(
+            {"date": block[0].view("datetime64[ns]"), "value": block[1].view(np.float64)},
+            copy=False,
+        )
+
+
+class SqlCacheStorage(CacheStorage):
+    # Series live in the indicator_data table. Saves append new points and
+    # upsert stored points whose value was revised; reads are indexed range queries.
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal, legacy: Optional[CacheStorage] = None):
+        self.session_factory = session_factory
+        self.legacy = legacy
+
+    def exists(self, indicator_code: str) -> bool:
+        with self.session_factory() as db:
+            query = select(IndicatorData.id).where(IndicatorData.indicator_code == indicator_code).limit(1)
+            return db.execute(query).first() is not None
+
+    def remove(self, indicator_code: str):
+        with self.session_factory() as db:
+            db.query(IndicatorData).filter(IndicatorData.indicator_code == indicator_code).delete(
+                synchronize_session=False
+            )
+            db.commit()
+
+    def fetched_at(self, indicator_code: str) -> Optional[datetime]:
+        # Only new or revised points are written, so this is when data last
+        # changed, which is an upper bound on the age of the last successful fetch.
+        with self.session_factory() as db:
+            query = select(func.max(IndicatorData.created_at)).where(IndicatorData.indicator_code == indicator_code)
+            created_at = db.execute(query).scalar()
+        if created_at is None:
+            return None
+        # created_at is stored as naive UTC.
+        return created_at.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+    def load(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        df = self.load_range(indicator_code)
+        if not df.empty:
+            return df
+        if self.legacy is not None:
+            return self._migrate(indicator_code)
+        return None
+
+    def _read(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        return self.load_range(indicator_code)
+
+    def load_range(self, indicator_code: str, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> pd.DataFrame:
+        query = select(IndicatorData.date, IndicatorData.value).where(IndicatorData.indicator_code == indicator_code)
+        if start is not None:
+            query = query.where(IndicatorData.date >= start)
+        if end is not None:
+            query = query.where(IndicatorData.date <= end)
+        query = query.order_by(IndicatorData.date.desc())
+
+        with self.session_factory() as db:
+            rows = db.execute(query).all()
+        return pd.DataFrame({
+            "date": pd.to_datetime([row[0] for row in rows]),
+            "value": np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)),
+        })
+
+    def _stored_points(self, db: Session, indicator_code: str, since: np.datetime64):
+        query = (
+            select(IndicatorData.date, IndicatorData.value)
+            .where(IndicatorData.indicator_code == indicator_code, IndicatorData.date >= pd.Timestamp(since).to_pydatetime())
+            .order_by(IndicatorData.date)
+        )
+        rows = db.execute(query).all()
+        dates = np.array([row[0] for row in rows], dtype="datetime64[ns]")
+        values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        return dates, values
+
+    def save(self, indicator_code: str, df: pd.DataFrame):
+        dates = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]")
+        values = df["value"].to_numpy(dtype=np.float64)
+        # First occurrence wins for duplicate dates; NaN cannot be stored.
+        mask = ~pd.Series(dates).duplicated().to_numpy() & ~np.isnan(values) & ~np.isnat(dates)
+        dates, values = dates[mask], values[mask]
+        if not len(dates):
+            return
+
+        with self.session_factory() as db:
+            stored_dates, stored_values = self._stored_points(db, indicator_code, dates.min())
+            # Points not stored yet, plus stored points whose value was revised upstream.
+            found = np.zeros(len(dates), dtype=bool)
+            changed = np.zeros(len(dates), dtype=bool)
+            if len(stored_dates):
+                pos = np.minimum(np.searchsorted(stored_dates, dates), len(stored_dates) - 1)
+                found = stored_dates[pos] == dates
+                changed = found & (stored_values[pos] != values)
+            new = ~found
+            if not new.any() and not changed.any():
+                return
+
+            now = datetime.utcnow()
+
+            def rows(selected: np.ndarray):
+                return [
+                    {"indicator_code": indicator_code, "date": date, "value": value, "created_at": now}
+                    for date, value in zip(dates[selected].astype("datetime64[us]").tolist(), values[selected].tolist())
+                ]
+
+            upsert = self._upsert(db) if changed.any() else None
+            if upsert is not None:
+                db.execute(upsert, rows(new | changed))
+            else:
+                # Append-only fast path, or a dialect without upserts.
+                if new.any():
+                    db.execute(self._insert_ignoring_duplicates(db), rows(new))
+                if changed.any():
+                    self._update_values(db, rows(changed))
+            db.commit()
+            logger.info(f"Stored {int(new.sum())} new and {int(changed.sum())} revised points for {indicator_code}")
+
+    def _dialect_insert(self, db: Session):
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return None
+        return dialect_insert(IndicatorData)
+
+    def _insert_ignoring_duplicates(self, db: Session):
+        statement = self._dialect_insert(db)
+        if statement is None:
+            return insert(IndicatorData)
+        return statement.on_conflict_do_nothing(index_elements=[IndicatorData.indicator_code, IndicatorData.date])
+
+    def _upsert(self, db: Session):
+        statement = self._dialect_insert(db)
+        if statement is None:
+            return None
+        return statement.on_conflict_do_update(
+            index_elements=[IndicatorData.indicator_code, IndicatorData.date],
+            set_={"value": statement.excluded.value, "created_at": statement.excluded.created_at},
+        )
+
+    def _update_values(self, db: Session, rows):
+        # One executemany UPDATE keyed on (indicator_code, date).
+        statement = (
+            update(IndicatorData.__table__)
+            .where(IndicatorData.indicator_code == bindparam("b_code"), IndicatorData.date == bindparam("b_date"))
+            .values(value=bindparam("b_value"), created_at=bindparam("b_created_at"))
+        )
+        db.connection().execute(statement, [
+            {"b_code": row["indicator_code"], "b_date": row["date"], "b_value": row["value"],
+             "b_created_at": row["created_at"]}
+            for row in rows
+        ])
+
+
+CACHE_STORAGES: Dict[str, Type[CacheStorage]] = {
+    "json": JsonCacheStorage,
+    "npy": NumpyCacheStorage,
+    "sql": SqlCacheStorage,
+}
+
+
+def create_cache_storage(cache_format: str, cache_dir: Path) -> CacheStorage:
+    storage_cls = CACHE_STORAGES.get(cache_format)
+    if storage_cls is None:
+        raise ValueError(f"Unknown cache format '{cache_format}', expected one of {sorted(CACHE_STORAGES)}")
+    if storage_cls is JsonCacheStorage:
+        return JsonCacheStorage(cache_dir)
+    legacy = NumpyCacheStorage(cache_dir, legacy=JsonCacheStorage(cache_dir))
+    if storage_cls is NumpyCacheStorage:
+        return legacy
+    return SqlCacheStorage(legacy=legacy)
@@ -1,339 +1,376 @@
 import akshare as ak
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
-import json
 import os
+import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.executors import upstream_executor
+from app.core.metrics import registry
+from app.models.database import Indicator
+from app.models.db_setup import SessionLocal
+from app.services.cache_storage import CacheStorage, create_cache_storage, filter_date_range
+from app.services.indicator_registry import IndicatorSpec, indicator_registry, normalize_series
+from app.services.period_parser import parse_chinese_date, parse_chinese_dates
+
 logger = logging.getLogger(__name__)
 
+UPSTREAM_FETCH_SECONDS = registry.histogram(
+    "itrade_upstream_fetch_duration_seconds", "Latency of akshare fetches per indicator.", ["indicator"]
+)
+UPSTREAM_FETCH_ERRORS = registry.counter(
+    "itrade_upstream_fetch_errors", "Failed or empty akshare fetches per indicator.", ["indicator", "reason"]
+)
+CACHE_LOAD_SECONDS = registry.histogram(
+    "itrade_cache_load_duration_seconds", "Persistent cache load latency.", ["result"]
+)
+CACHE_SAVE_SECONDS = registry.histogram("itrade_cache_save_duration_seconds", "Persistent cache save latency.")
+CACHE_SAVE_ERRORS = registry.counter("itrade_cache_save_errors", "Persistent cache saves that failed.")
+
+
+def refresh_interval(update_frequency: Optional[str]) -> int:
+    intervals = {
+        "日度": settings.refresh_interval_daily,
+        "月度": settings.refresh_interval_monthly,
+        "季度": settings.refresh_interval_quarterly,
+    }
+    return intervals.get(update_frequency, settings.refresh_interval_monthly)
+
+
+class SeriesUpdate:
+    # What a refresh changed. `added` is how many rows it put in front of the
+    # previous series (stored newest first), or None when existing rows were
+    # revised too or there was no previous series.
+    def __init__(self, previous_version: Optional[str], version: str, added: Optional[int]):
+        self.previous_version = previous_version
+        self.version = version
+        self.added = added
+
+
+# Called as listener(indicator_code, previous_df_or_None, new_df, update) after
+# an upstream fetch returns data that differs from what was stored.
+SeriesListener = Callable[[str, Optional[pd.DataFrame], pd.DataFrame, SeriesUpdate], None]
+
+
+def _version_rows(df: pd.DataFrame) -> np.ndarray:
+    # (n, 2) date ticks and value bits, oldest row first, so the oldest rows
+    # of a series are a byte prefix of the whole.
+    rows = np.zeros((len(df), 2), dtype=np.int64)
+    if "date" in df.columns:
+        rows[:, 0] = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]").view(np.int64)[::-1]
+    if "value" in df.columns:
+        rows[:, 1] = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype="float64").view(np.int64)[::-1]
+    return rows
+
+
+def series_versions(df: pd.DataFrame, oldest_rows: int) -> Tuple[str, Optional[str]]:
+    # The version of `df` and, from the same pass, the version its oldest
+    # `oldest_rows` rows would have on their own (None if out of range).
+    rows = _version_rows(df)
+    digest = hashlib.blake2b(digest_size=12)
+    if not 0 <= oldest_rows <= len(rows):
+        digest.update(rows.tobytes())
+        return digest.hexdigest(), None
+    digest.update(rows[:oldest_rows].tobytes())
+    prefix = digest.copy().hexdigest()
+    digest.update(rows[oldest_rows:].tobytes())
+    return digest.hexdigest(), prefix
+
+
+def series_version(df: pd.DataFrame) -> str:
+    return series_versions(df, -1)[0]
+
 
 class DataFetcher:
-    def __init__(self, cache_dir: str = "./data/cache"):
+    def __init__(self, cache_dir: str = "./data/cache", storage: Optional[CacheStorage] = None):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.indicator_cache: Dict[str, Any] = {}
-
-    def _get_cache_key(self, indicator_code: str) -> str:
-        return f"{indicator_code}_cache.json"
+        self.storage = storage or create_cache_storage(settings.cache_format, self.cache_dir)
+        self.indicator_cache = TTLCache(ttl=settings.cache_ttl, max_entries=settings.cache_max_entries)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._fetched_at: Dict[str, float] = {}
+        self._versions: Dict[str, str] = {}
+        self._listeners: List[SeriesListener] = []
+        self._revalidate_attempted_at: Dict[str, float] = {}
+        # Background refreshes submitted but not finished yet.
+        self._revalidating: Set[str] = set()
 
     def _load_from_cache(self, indicator_code: str) -> Optional[pd.DataFrame]:
-        cache_file = self.cache_dir / self._get_cache_key(indicator_code)
-        if cache_file.exists():
-            try:
-                df = pd.read_json(cache_file)
-                return df
-            except (json.JSONDecodeError, ValueError, pd.errors.EmptyDataError) as e:
-                logger.warning(f"Failed to load cache for {indicator_code}: {e}")
-                return None
-        return None
+        started = time.perf_counter()
+        df = self.storage.load(indicator_code)
+        result = "miss" if df is None or df.empty else "hit"
+        CACHE_LOAD_SECONDS.observe(time.perf_counter() - started, result=result)
+        return df
 
     def _save_to_cache(self, indicator_code: str, df: pd.DataFrame):
-        cache_file = self.cache_dir / self._get_cache_key(indicator_code)
-        df.to_json(cache_file, orient="records", date_format="iso")
-
-    def parse_chinese_date(self, date_str: str) -> Optional[datetime]:
         try:
-            if '第1-4季度' in date_str:
-                year = date_str.replace('年第1-4季度', '')
-                return datetime(int(year), 12, 31)
-            elif '第1-3季度' in date_str:
-                year = date_str.replace('年第1-3季度', '')
-                return datetime(int(year), 9, 30)
-            elif '第1-2季度' in date_str:
-                year = date_str.replace('年第1-2季度', '')
-                return datetime(int(year), 6, 30)
-            elif '第1季度' in date_str:
-                year = date_str.replace('年第1季度', '')
-                return datetime(int(year), 3, 31)
-            elif '年' in date_str and '月' in date_str:
-                year = int(date_str[:4])
-                month = int(date_str[5:7])
-                return datetime(year, month, 1)
-            return None
-        except (ValueError, TypeError) as e:
-            logger.debug(f"Failed to parse date '{date_str}': {e}")
+            with CACHE_SAVE_SECONDS.time():
+                self.storage.save(indicator_code, df)
+        except Exception as e:
+            CACHE_SAVE_ERRORS.inc()
+            logger.warning(f"Failed to save cache for {indicator_code}: {e}")
+
+    def add_listener(self, listener: SeriesListener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: SeriesListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _previous_series(self, indicator_code: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        entry = self.indicator_cache.peek(indicator_code)
+        if entry is not None and not entry[1].empty:
+            return entry[1], entry[0]
+        if not self._listeners:
+            return None, None
+        previous = self._load_from_cache(indicator_code)
+        if previous is None or previous.empty:
+            return None, None
+        return previous, series_version(previous)
+
+    def _notify(self, indicator_code: str, previous: Optional[pd.DataFrame], df: pd.DataFrame,
+                update: SeriesUpdate):
+        for listener in list(self._listeners):
+            try:
+                listener(indicator_code, previous, df, update)
+            except Exception as e:
+                logger.error(f"Series listener {listener!r} failed for {indicator_code}: {e}")
+
+    def _remember(self, indicator_code: str, df: pd.DataFrame, version: Optional[str] = None):
+        # The frame and its version are one cache entry, so readers always see
+        # a matching pair. _versions outlives eviction and keeps ETags stable.
+        version = version or series_version(df)
+        self.indicator_cache.set(indicator_code, (version, df))
+        self._versions[indicator_code] = version
+
+    def _cached_frame(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        entry = self.indicator_cache.get(indicator_code)
+        return entry[1] if entry is not None else None
+
+    def _peek_frame(self, indicator_code: str) -> Optional[pd.DataFrame]:
+        entry = self.indicator_cache.peek(indicator_code)
+        return entry[1] if entry is not None else None
+
+    def series_version(self, indicator_code: str) -> Optional[str]:
+        return self._versions.get(indicator_code)
+
+    def frame_version(self, indicator_code: str, df: pd.DataFrame) -> Optional[str]:
+        # The version of `df` if it is the frame currently held for the code.
+        entry = self.indicator_cache.peek(indicator_code)
+        if entry is None or entry[1] is not df:
             return None
+        return entry[0]
 
-    def fetch_gdp_data(self) -> pd.DataFrame:
-        try:
-            df = ak.macro_china_gdp()
-            if df.empty or '季度' not in df.columns:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = df["季度"].apply(self.parse_chinese_date)
-            
-            col_name = "国内生产总值-同比增长"
-            if col_name in df.columns:
-                result["value"] = pd.to_numeric(df[col_name], errors="coerce")
-            else:
-                return pd.DataFrame()
-            
-            result = result.dropna()
-            max_date = datetime.now()
-            result = result[result["date"] <= max_date]
-            result = result.sort_values("date", ascending=False)
-            return result
-        except Exception as e:
-            logger.error(f"获取GDP数据失败: {e}")
-            return pd.DataFrame()
+    def fetched_at(self, indicator_code: str) -> Optional[datetime]:
+        fetched_at = self._fetched_at.get(indicator_code)
+        return datetime.fromtimestamp(fetched_at) if fetched_at is not None else None
 
-    def fetch_cpi_data(self) -> pd.DataFrame:
-        try:
-            df = ak.macro_china_cpi()
-            if df.empty or '月份' not in df.columns:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = df["月份"].apply(self.parse_chinese_date)
-            
-            col_name = "全国-同比增长"
-            if col_name in df.columns:
-                result["value"] = pd.to_numeric(df[col_name], errors="coerce")
-            else:
-                return pd.DataFrame()
-            
-            result = result.dropna()
-            max_date = datetime.now()
-            result = result[result["date"] <= max_date]
-            result = result.sort_values("date", ascending=False)
-            return result
-        except Exception as e:
-            logger.error(f"获取CPI数据失败: {e}")
-            return pd.DataFrame()
+    def invalidate(self, indicator_code: Optional[str] = None):
+        if indicator_code is None:
+            self.indicator_cache.clear()
+        else:
+            self.indicator_cache.invalidate(indicator_code)
 
-    def fetch_pmi_data(self) -> pd.DataFrame:
-        try:
-            df = ak.macro_china_pmi()
-            if df.empty or '月份' not in df.columns:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = df["月份"].apply(self.parse_chinese_date)
-            
-            col_name = "制造业-指数"
-            if col_name in df.columns:
-                result["value"] = pd.to_numeric(df[col_name], errors="coerce")
-            else:
-                return pd.DataFrame()
-            
-            result = result.dropna()
-            max_date = datetime.now()
-            result = result[result["date"] <= max_date]
-            result = result.sort_values("date", ascending=False)
-            return result
-        except Exception as e:
-            logger.error(f"获取PMI数据失败: {e}")
-            return pd.DataFrame()
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.indicator_cache.stats()
 
-    def fetch_ppi_data(self) -> pd.DataFrame:
-        try:
-            df = ak.macro_china_ppi()
-            if df.empty or '月份' not in df.columns:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = df["月份"].apply(self.parse_chinese_date)
-            result["value"] = pd.to_numeric(df["当月同比增长"], errors="coerce")
-            
-            result = result.dropna()
-            max_date = datetime.now()
-            result = result[result["date"] <= max_date]
-            result = result.sort_values("date", ascending=False)
-            return result
-        except Exception as e:
-            logger.error(f"获取PPI数据失败: {e}")
-            return pd.DataFrame()
+    def parse_chinese_date(self, date_str: str) -> Optional[datetime]:
+        return parse_chinese_date(date_str)
 
-    def fetch_m2_data(self) -> pd.DataFrame:
-        try:
-            df = ak.macro_china_m2_year()
-            if df.empty:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            for col in df.columns:
-                if 'date' in str(col).lower() or '日期' in str(col):
-                    result["date"] = pd.to_datetime(df[col], errors="coerce")
-                elif 'm2' in str(col).lower():
-                    result["value"] = pd.to_numeric(df[col], errors="coerce")
-            
-            if result.empty:
-                result["value"] = df.iloc[:, 1]
-            
-            if "date" not in result.columns:
-                result["date"] = pd.date_range(start='2020-01-01', periods=len(result), freq='YS')
-            
-            return result.dropna()
-        except Exception as e:
-            logger.error(f"获取M2数据失败: {e}")
+    def parse_chinese_dates(self, values: pd.Series) -> pd.Series:
+        return parse_chinese_dates(values)
+
+    def fetch_indicator_data(self, indicator_code: str, force_update: bool = False) -> pd.DataFrame:
+        if not force_update:
+            cached = self.get_cached(indicator_code)
+            if not cached.empty:
+                return cached
+
+        return self._fetch_single_flight(indicator_code)
+
+    async def fetch_indicator_data_async(self, indicator_code: str, force_update: bool = False) -> pd.DataFrame:
+        # Memory hits are answered on the event loop; anything that may touch
+        # storage or akshare runs on the bounded upstream executor.
+        if force_update:
+            return await upstream_executor.run(self._fetch_single_flight, indicator_code)
+        cached = self._cached_frame(indicator_code)
+        if cached is not None:
+            return cached
+        return await upstream_executor.run(self._load_or_fetch, indicator_code)
+
+    def _load_or_fetch(self, indicator_code: str) -> pd.DataFrame:
+        stored = self._load_stored(indicator_code)
+        if not stored.empty:
+            return stored
+        return self._fetch_single_flight(indicator_code)
+
+    def get_cached(self, indicator_code: str) -> pd.DataFrame:
+        cached = self._cached_frame(indicator_code)
+        if cached is not None:
+            return cached
+        return self._load_stored(indicator_code)
+
+    def _load_stored(self, indicator_code: str) -> pd.DataFrame:
+        cached = self._load_from_cache(indicator_code)
+        if cached is None or cached.empty:
             return pd.DataFrame()
+        self._remember(indicator_code, cached)
+        if indicator_code not in self._fetched_at:
+            stored_at = self.storage.fetched_at(indicator_code)
+            if stored_at is not None:
+                self._fetched_at[indicator_code] = stored_at.timestamp()
+        return cached
+
+    def freshness(self, indicator_code: str, df: pd.DataFrame) -> Dict[str, Any]:
+        meta = self.series_meta(indicator_code)
+        if meta["is_stale"] and not df.empty:
+            meta["revalidating"] = self.revalidate(indicator_code)
+        return meta
 
-    def fetch_rate_data(self) -> pd.DataFrame:
+    def series_meta(self, indicator_code: str) -> Dict[str, Any]:
+        fetched_at = self._fetched_at.get(indicator_code)
+        info = self.get_indicator_info(indicator_code)
+        max_age = refresh_interval(info["update_frequency"] if info else None)
+        age = time.time() - fetched_at if fetched_at is not None else None
+        return {
+            "fetched_at": self.fetched_at(indicator_code),
+            "age_seconds": round(age, 3) if age is not None else None,
+            "is_stale": age is None or age > max_age,
+            "revalidating": indicator_code in self._revalidating or indicator_code in self._inflight,
+        }
+
+    def revalidate(self, indicator_code: str) -> bool:
+        now = time.time()
+        with self._inflight_lock:
+            if indicator_code in self._inflight or indicator_code in self._revalidating:
+                return True
+            last_attempt = self._revalidate_attempted_at.get(indicator_code, 0.0)
+            if now - last_attempt < settings.revalidate_retry_interval:
+                return False
+            self._revalidate_attempted_at[indicator_code] = now
+            self._revalidating.add(indicator_code)
+        upstream_executor.submit(self._revalidate, indicator_code)
+        return True
+
+    def _revalidate(self, indicator_code: str):
         try:
-            df = ak.macro_china_lpr()
+            df = self._fetch_single_flight(indicator_code)
             if df.empty:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = pd.to_datetime(df["TRADE_DATE"], errors="coerce")
-            result["value"] = pd.to_numeric(df["LPR1Y"], errors="coerce")
-            
-            result = result.dropna()
-            result = result.sort_values("date", ascending=False)
-            return result
+                logger.warning(f"Background refresh of {indicator_code} returned no data, serving stale copy")
         except Exception as e:
-            logger.error(f"获取利率数据失败: {e}")
-            return pd.DataFrame()
+            logger.warning(f"Background refresh of {indicator_code} failed: {e}")
+        finally:
+            with self._inflight_lock:
+                self._revalidating.discard(indicator_code)
+
+    def fetch_indicator_range(self, indicator_code: str, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> pd.DataFrame:
+        cached = self._cached_frame(indicator_code)
+        if cached is None:
+            df = self.storage.load_range(indicator_code, start, end)
+            if not df.empty:
+                return df
+            cached = self.fetch_indicator_data(indicator_code)
+        if cached.empty:
+            return cached
+        return filter_date_range(cached, start, end)
+
+    def _fetch_single_flight(self, indicator_code: str) -> pd.DataFrame:
+        with self._inflight_lock:
+            future = self._inflight.get(indicator_code)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[indicator_code] = future
+
+        if not is_leader:
+            return future.result()
 
-    def fetch_exchange_data(self) -> pd.DataFrame:
         try:
-            df = ak.currency_latest()
-            if df.empty:
-                return pd.DataFrame()
-            
-            usd_cny = df[df['currency'].str.contains('人民币|CNY', case=False, na=False)]
-            if usd_cny.empty:
-                usd_cny = df[df['currency'].str.contains('美元|USD', case=False, na=False)]
-            
-            if usd_cny.empty:
-                return pd.DataFrame()
-            
-            result = pd.DataFrame()
-            result["date"] = pd.Timestamp.now()
-            result["value"] = pd.to_numeric(usd_cny.iloc[0]["rate"], errors="coerce")
-            return result
-        except Exception as e:
-            logger.error(f"获取汇率数据失败: {e}")
+            df = self._fetch_from_source(indicator_code)
+            future.set_result(df)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(indicator_code, None)
+        return df
+
+    def fetch_source_data(self, indicator_code: str) -> pd.DataFrame:
+        # Loads and normalizes one indicator from akshare, bypassing all caches.
+        spec = indicator_registry.get(indicator_code)
+        if spec is None:
             return pd.DataFrame()
+        return self._fetch_spec(spec)
 
-    def fetch_erp_data(self) -> pd.DataFrame:
+    def _fetch_spec(self, spec: IndicatorSpec) -> pd.DataFrame:
         try:
-            pe_df = ak.stock_a_ttm_lyr()
-            bond_df = ak.bond_zh_us_rate()
-            
-            if pe_df.empty or bond_df.empty:
-                return pd.DataFrame()
-            
-            pe_df["date"] = pd.to_datetime(pe_df["date"])
-            bond_df["date"] = pd.to_datetime(bond_df["日期"])
-            bond_df["bond_10y"] = pd.to_numeric(bond_df["中国国债收益率10年"], errors="coerce")
-            
-            pe_df = pe_df[["date", "middlePETTM"]].copy()
-            pe_df["middlePETTM"] = pd.to_numeric(pe_df["middlePETTM"], errors="coerce")
-            
-            merged = pd.merge_asof(
-                pe_df.sort_values("date"),
-                bond_df[["date", "bond_10y"]].sort_values("date"),
-                on="date",
-                direction="nearest"
-            )
-            
-            merged["value"] = (1 / merged["middlePETTM"] * 100) - merged["bond_10y"]
-            
-            result = merged[["date", "value"]].dropna()
-            result = result.sort_values("date", ascending=False)
-            return result
+            frames = [getattr(ak, source)() for source in spec.sources]
+            return normalize_series(spec, frames)
         except Exception as e:
-            logger.error(f"获取ERP数据失败: {e}")
+            logger.error(f"获取{spec.name}数据失败: {e}")
             return pd.DataFrame()
 
-    def fetch_indicator_data(self, indicator_code: str, force_update: bool = False) -> pd.DataFrame:
-        if not force_update:
-            cached = self._load_from_cache(indicator_code)
-            if cached is not None and not cached.empty:
-                return cached
-
-        fetch_methods = {
-            "gdp": self.fetch_gdp_data,
-            "cpi": self.fetch_cpi_data,
-            "pmi": self.fetch_pmi_data,
-            "ppi": self.fetch_ppi_data,
-            "m2": self.fetch_m2_data,
-            "rate": self.fetch_rate_data,
-            "exchange": self.fetch_exchange_data,
-            "erp": self.fetch_erp_data,
-        }
+    def _fetch_from_source(self, indicator_code: str) -> pd.DataFrame:
+        if indicator_code not in indicator_registry:
+            return pd.DataFrame()
 
-        fetch_fn = fetch_methods.get(indicator_code)
-        if fetch_fn:
-            df = fetch_fn()
-            if not df.empty:
-                self._save_to_cache(indicator_code, df)
-            return df
+        try:
+            with UPSTREAM_FETCH_SECONDS.time(indicator=indicator_code):
+                df = self.fetch_source_data(indicator_code)
+        except Exception:
+            UPSTREAM_FETCH_ERRORS.inc(indicator=indicator_code, reason="exception")
+            raise
+        # _fetch_spec logs and swallows akshare errors, returning an empty frame.
+        if df.empty:
+            UPSTREAM_FETCH_ERRORS.inc(indicator=indicator_code, reason="empty")
+        else:
+            previous, previous_version = self._previous_series(indicator_code)
+            self._save_to_cache(indicator_code, df)
+            # One hash pass also tells whether the refresh only appended: then
+            # its oldest rows hash to the previous version.
+            version, kept_version = series_versions(df, len(previous) if previous is not None else -1)
+            self._remember(indicator_code, df, version)
+            self._fetched_at[indicator_code] = time.time()
+            if previous is None or previous_version != version:
+                added = len(df) - len(previous) if previous is not None and kept_version == previous_version else None
+                self._notify(indicator_code, previous, df, SeriesUpdate(previous_version, version, added))
+        return df
 
-        return pd.DataFrame()
+    def register_indicators(self):
+        with SessionLocal() as db:
+            known = {code for (code,) in db.query(Indicator.code).all()}
+            for info in self.get_available_indicators():
+                if info["code"] not in known:
+                    db.add(Indicator(**info))
+            db.commit()
 
     def get_available_indicators(self) -> List[Dict]:
-        return [
-            {
-                "code": "gdp",
-                "name": "国内生产总值(GDP)",
-                "category": "经济增长",
-                "unit": "%",
-                "description": "季度GDP同比增长率",
-                "update_frequency": "季度",
-            },
-            {
-                "code": "cpi",
-                "name": "居民消费价格指数(CPI)",
-                "category": "物价水平",
-                "unit": "%",
-                "description": "同比 CPI 涨跌幅",
-                "update_frequency": "月度",
-            },
-            {
-                "code": "pmi",
-                "name": "采购经理指数(PMI)",
-                "category": "经济景气",
-                "unit": "",
-                "description": "制造业PMI指数",
-                "update_frequency": "月度",
-            },
-            {
-                "code": "ppi",
-                "name": "工业生产者出厂价格指数(PPI)",
-                "category": "物价水平",
-                "unit": "%",
-                "description": "同比PPI涨跌幅",
-                "update_frequency": "月度",
-            },
-            {
-                "code": "m2",
-                "name": "广义货币(M2)",
-                "category": "货币金融",
-                "unit": "万亿元",
-                "description": "M2货币供应量",
-                "update_frequency": "月度",
-            },
-            {
-                "code": "rate",
-                "name": "LPR利率(1年期)",
-                "category": "货币金融",
-                "unit": "%",
-                "description": "贷款市场报价利率(LPR)1年期",
-                "update_frequency": "月度",
-            },
-            {
-                "code": "exchange",
-                "name": "人民币汇率",
-                "category": "国际收支",
-                "unit": "",
-                "description": "美元兑人民币汇率",
-                "update_frequency": "日度",
-            },
-            {
-                "code": "erp",
-                "name": "股权风险溢价(ERP)",
-                "category": "市场估值",
-                "unit": "%",
-                "description": "A股ERP = 1/PE(TTM) - 10年期国债收益率",
-                "update_frequency": "日度",
-            },
-        ]
+        return indicator_registry.infos()
+
+    def get_indicator_info(self, indicator_code: str) -> Optional[Dict]:
+        return indicator_registry.info(indicator_code)
 
 
 data_fetcher = DataFetcher()
+
+
+def _memory_cache_samples(field: str):
+    return lambda: [({}, data_fetcher.indicator_cache.stats()[field])]
+
+
+registry.callback("itrade_memory_cache_hits", "In-memory series cache hits.", "counter", _memory_cache_samples("hits"))
+registry.callback("itrade_memory_cache_misses", "In-memory series cache misses.", "counter", _memory_cache_samples("misses"))
+registry.callback("itrade_memory_cache_evictions", "In-memory series cache evictions.", "counter", _memory_cache_samples("evictions"))
+registry.callback("itrade_memory_cache_entries", "Series held in the in-memory cache.", "gauge", _memory_cache_samples("size"))
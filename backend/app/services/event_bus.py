@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.data_fetcher import SeriesUpdate
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    def __init__(self, user_id: Optional[int], max_queue: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]):
+        # Slow consumers lose their oldest events rather than growing without bound.
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBus:
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscriptions: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def unbind(self):
+        self._loop = None
+        self._subscriptions.clear()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, user_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(user_id, self.max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: Dict[str, Any], user_id: Optional[int] = None):
+        # Safe to call from any thread; delivery happens on the event loop.
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._subscriptions:
+            return
+        loop.call_soon_threadsafe(self._dispatch, event, user_id)
+
+    def _dispatch(self, event: Dict[str, Any], user_id: Optional[int]):
+        for subscription in list(self._subscriptions):
+            if user_id is None or subscription.user_id == user_id:
+                subscription.offer(event)
+
+    def on_series_updated(self, indicator_code: str, previous: Optional[pd.DataFrame], df: pd.DataFrame,
+                          update: SeriesUpdate):
+        if not self._subscriptions or "date" not in df.columns:
+            return
+        dates = pd.to_datetime(df["date"])
+        # Series are stored newest first, so an append adds rows at the front.
+        added = update.added
+        new_rows = df.iloc[:added] if added is not None else df.iloc[0:0]
+        latest = int(dates.to_numpy().argmax())
+        self.publish({
+            "type": "indicator_updated",
+            "indicator_code": indicator_code,
+            "latest_date": dates.iloc[latest].isoformat(),
+            "latest_value": float(df["value"].iloc[latest]),
+            "points": [
+                {"date": date.isoformat(), "value": float(value)}
+                for date, value in zip(pd.to_datetime(new_rows["date"]), new_rows["value"])
+            ],
+            # Revisions to existing points (or a first load) are not sent as a
+            # delta; clients should refetch the series.
+            "reset": added is None,
+        })
+
+
+event_bus = EventBus(max_queue=settings.sse_queue_size)
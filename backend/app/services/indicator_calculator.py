@@ -1,11 +1,31 @@
+import threading
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from app.services.data_fetcher import data_fetcher
+from app.core.executors import compute_executor
+from app.core.metrics import registry
+from app.services.alignment import AlignedBlock, alignment_engine
+from app.services.data_fetcher import SeriesUpdate, data_fetcher
+from app.services.rolling_stats import RollingStats, updated_stats
+
+TREND_MEMO_LOOKUPS = registry.counter(
+    "itrade_trend_memo_lookups", "Trend results served from (hit) or computed past (miss) the memo.", ["result"]
+)
+
+
+def format_date(value) -> str:
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else str(value)[:10]
 
 
 class IndicatorCalculator:
+    def __init__(self):
+        # indicator_code -> (series_version, stats built from that series)
+        self._stats: Dict[str, Tuple[str, RollingStats]] = {}
+        self._stats_lock = threading.Lock()
+        # indicator_code -> (series_version, trend result)
+        self._trend_memo: Dict[str, Tuple[str, Dict]] = {}
+
     def calculate_ma(self, data: List[float], window: int = 7) -> Optional[float]:
         if len(data) < window:
             return None
@@ -52,18 +72,29 @@ class IndicatorCalculator:
         if pd.isna(recent_ma7) or pd.isna(recent_ma30):
             return {"predicted": None, "confidence": "low"}
         
-        trend = "up" if recent_ma7 > recent_ma30 else "down"
+        return self._predict(recent_ma7, recent_ma30, len(data), days)
+
+    def _predict(self, ma7: float, ma30: float, count: int, days: int) -> Dict:
+        trend = "up" if ma7 > ma30 else "down"
         
-        growth_rate = (recent_ma7 - recent_ma30) / recent_ma30 * 100
+        growth_rate = (ma7 - ma30) / ma30 * 100
         
-        predicted = recent_ma7 * (1 + growth_rate / 100 * days / 30)
+        predicted = ma7 * (1 + growth_rate / 100 * days / 30)
         
         return {
             "predicted": float(predicted),
             "trend": trend,
-            "confidence": "medium" if len(data) >= 30 else "low"
+            "confidence": "medium" if count >= 30 else "low"
         }
 
+    def stats_prediction(self, stats: RollingStats, days: int = 7) -> Dict:
+        if stats.count < 10:
+            return {"predicted": None, "confidence": "low"}
+        ma7, ma30 = stats.ma(7), stats.ma(30)
+        if ma7 is None or ma30 is None:
+            return {"predicted": None, "confidence": "low"}
+        return self._predict(ma7, ma30, stats.count, days)
+
     def calculate_volatility(self, data: List[float]) -> float:
         if len(data) < 2:
             return 0.0
@@ -71,7 +102,37 @@ class IndicatorCalculator:
 
     def get_indicator_trend(self, indicator_code: str) -> Dict:
         df = data_fetcher.fetch_indicator_data(indicator_code)
-        
+        cached = self.cached_trend(indicator_code)
+        if cached is not None:
+            return cached
+        version = data_fetcher.frame_version(indicator_code, df)
+        return self._remember_trend(indicator_code, version, self.trend_from_frame(indicator_code, df))
+
+    async def get_indicator_trend_async(self, indicator_code: str) -> Dict:
+        df = await data_fetcher.fetch_indicator_data_async(indicator_code)
+        cached = self.cached_trend(indicator_code)
+        if cached is not None:
+            return cached
+        version = data_fetcher.frame_version(indicator_code, df)
+        trend = await compute_executor.run(self.trend_from_frame, indicator_code, df)
+        return self._remember_trend(indicator_code, version, trend)
+
+    def cached_trend(self, indicator_code: str) -> Optional[Dict]:
+        version = data_fetcher.series_version(indicator_code)
+        entry = self._trend_memo.get(indicator_code)
+        if version is not None and entry is not None and entry[0] == version:
+            TREND_MEMO_LOOKUPS.inc(result="hit")
+            return entry[1]
+        TREND_MEMO_LOOKUPS.inc(result="miss")
+        return None
+
+    def _remember_trend(self, indicator_code: str, version: Optional[str], trend: Dict) -> Dict:
+        # version is None when the frame was replaced while we fetched it.
+        if version is not None:
+            self._trend_memo[indicator_code] = (version, trend)
+        return trend
+
+    def trend_from_frame(self, indicator_code: str, df: pd.DataFrame) -> Dict:
         if df.empty:
             return {
                 "indicator_code": indicator_code,
@@ -79,11 +140,15 @@ class IndicatorCalculator:
                 "change_percent": 0.0,
                 "ma_7": None,
                 "ma_30": None,
-                "prediction": None
+                "prediction": None,
+                "latest_date": None
             }
         
+        if "date" in df.columns and "value" in df.columns:
+            return self.trend_from_stats(indicator_code, self.rolling_stats(indicator_code, df))
+
         if "date" in df.columns:
-            values = df["value"].tolist() if "value" in df.columns else df.iloc[:, 1].tolist()
+            values = df.iloc[:, 1].tolist()
         else:
             values = df.iloc[:, 0].tolist()
         
@@ -102,21 +167,98 @@ class IndicatorCalculator:
             "ma_30": ma_30,
             "prediction": prediction,
             "volatility": volatility,
-            "latest_value": values[0] if values else None
+            "latest_value": values[0] if values else None,
+            "latest_date": format_date(df["date"].iloc[0]) if "date" in df.columns else None
         }
 
-    def compare_indicators(self, codes: List[str], start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict:
+    def rolling_stats(self, indicator_code: str, df: pd.DataFrame) -> RollingStats:
+        version = data_fetcher.frame_version(indicator_code, df)
+        with self._stats_lock:
+            entry = self._stats.get(indicator_code)
+        if version is not None and entry is not None and entry[0] == version:
+            return entry[1]
+        stats = RollingStats.from_frame(df)
+        # Frames that are no longer the fetcher's current one are not cached.
+        if version is not None:
+            with self._stats_lock:
+                self._stats[indicator_code] = (version, stats)
+        return stats
+
+    def on_series_updated(self, indicator_code: str, previous: Optional[pd.DataFrame], df: pd.DataFrame,
+                          update: SeriesUpdate):
+        # Refreshes usually only add newer points; fold those into the
+        # existing stats instead of rescanning the whole history. The fetcher
+        # has already established whether the update is a pure append.
+        self._trend_memo.pop(indicator_code, None)
+        with self._stats_lock:
+            entry = self._stats.pop(indicator_code, None)
+        if entry is None or update.added is None or entry[0] != update.previous_version:
+            return
+        if df.empty or "date" not in df.columns or "value" not in df.columns:
+            return
+        updated = updated_stats(entry[1], df, update.added)
+        with self._stats_lock:
+            self._stats[indicator_code] = (update.version, updated)
+
+    def trend_from_stats(self, indicator_code: str, stats: RollingStats) -> Dict:
+        # The list methods only look at the last few values, which the tail holds.
+        tail = list(stats.tail)
+        return {
+            "indicator_code": indicator_code,
+            "trend": self.analyze_trend(tail),
+            "change_percent": self.calculate_change_percent(tail),
+            "ma_7": stats.ma(7),
+            "ma_30": stats.ma(30),
+            "prediction": self.stats_prediction(stats),
+            "volatility": stats.volatility(),
+            "latest_value": stats.latest,
+            "latest_date": format_date(stats.latest_date) if stats.latest_date is not None else None
+        }
+
+    def compare_indicators(self, codes: List[str], start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           columnar: bool = False, freq: Optional[str] = None, how: str = "last",
+                           fill: str = "drop") -> Dict:
+        if freq:
+            return self.compare_aligned(alignment_engine.aligned(codes, freq, start_date, end_date, how, fill), columnar)
+        start = pd.to_datetime(start_date).to_pydatetime() if start_date else None
+        end = pd.to_datetime(end_date).to_pydatetime() if end_date else None
         results = {}
         for code in codes:
-            df = data_fetcher.fetch_indicator_data(code)
-            if not df.empty:
-                if start_date:
-                    df = df[df["date"] >= pd.to_datetime(start_date)]
-                if end_date:
-                    df = df[df["date"] <= pd.to_datetime(end_date)]
+            df = data_fetcher.fetch_indicator_range(code, start, end)
+            if df.empty:
+                continue
+            latest_value = float(df["value"].iloc[0]) if "value" in df.columns else float(df.iloc[0, 1])
+            if columnar:
+                results[code] = {
+                    "dates": df["date"].to_numpy(dtype="datetime64[ms]").view(np.int64).tolist(),
+                    "values": df["value"].tolist(),
+                    "latest_value": latest_value
+                }
+            else:
                 results[code] = {
                     "data": df.to_dict(orient="records"),
-                    "latest_value": float(df["value"].iloc[0]) if "value" in df.columns else float(df.iloc[0, 1])
+                    "latest_value": latest_value
+                }
+        return results
+
+    def compare_aligned(self, block: AlignedBlock, columnar: bool = False) -> Dict:
+        # Same shape as the native compare output (newest first), with every
+        # series on the block's period starts; gaps under fill="keep" are null.
+        dates = block.period_starts()[::-1]
+        results = {}
+        for code in block.codes:
+            column = block.column(code)[::-1]
+            values = np.where(np.isnan(column), None, column).tolist()
+            if columnar:
+                results[code] = {
+                    "dates": dates.view(np.int64).tolist(),
+                    "values": values,
+                    "latest_value": block.latest_value(code)
+                }
+            else:
+                results[code] = {
+                    "data": [{"date": date, "value": value} for date, value in zip(dates.tolist(), values)],
+                    "latest_value": block.latest_value(code)
                 }
         return results
 
@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.services.period_parser import parse_chinese_dates
+
+EMPTY = pd.DataFrame()
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    code: str
+    name: str
+    category: str
+    unit: str
+    description: str
+    update_frequency: str
+    # akshare functions called (without arguments) to load the raw frames.
+    sources: Tuple[str, ...]
+    date_column: str = "date"
+    value_column: str = "value"
+    # "period" for akshare's Chinese labels (2024年第1季度, 2024年04月份),
+    # "datetime" for anything pd.to_datetime understands.
+    date_format: str = "datetime"
+    drop_future: bool = False
+    # Builds a date/value frame from the raw frames when picking two columns
+    # is not enough.
+    transform: Optional[Callable[..., pd.DataFrame]] = None
+
+    def info(self) -> Dict:
+        return {
+            "code": self.code,
+            "name": self.name,
+            "category": self.category,
+            "unit": self.unit,
+            "description": self.description,
+            "update_frequency": self.update_frequency,
+        }
+
+
+def normalize_series(spec: IndicatorSpec, frames: List[pd.DataFrame]) -> pd.DataFrame:
+    # The one pipeline every indicator goes through: parse dates, coerce
+    # values, drop incomplete (and optionally future) rows, newest first.
+    if any(frame is None or frame.empty for frame in frames):
+        return EMPTY
+    raw = spec.transform(*frames) if spec.transform else frames[0]
+    if raw.empty or spec.date_column not in raw.columns or spec.value_column not in raw.columns:
+        return EMPTY
+
+    if spec.date_format == "period":
+        dates = parse_chinese_dates(raw[spec.date_column])
+    else:
+        dates = pd.to_datetime(raw[spec.date_column], errors="coerce")
+    values = pd.to_numeric(raw[spec.value_column], errors="coerce")
+
+    keep = dates.notna() & values.notna()
+    if spec.drop_future:
+        keep &= dates <= datetime.now()
+    result = pd.DataFrame({"date": dates[keep], "value": values[keep]})
+    return result.sort_values("date", ascending=False)
+
+
+def m2_frame(df: pd.DataFrame) -> pd.DataFrame:
+    date_column = next((c for c in df.columns if "date" in str(c).lower() or "日期" in str(c)), None)
+    value_column = next((c for c in df.columns if "m2" in str(c).lower()), None)
+    if value_column is None:
+        value_column = "今值" if "今值" in df.columns else df.columns[1]
+    result = pd.DataFrame({"value": df[value_column]})
+    if date_column is not None:
+        result["date"] = df[date_column]
+    else:
+        result["date"] = pd.date_range(start="2020-01-01", periods=len(result), freq="YS")
+    return result
+
+
+def exchange_frame(df: pd.DataFrame) -> pd.DataFrame:
+    usd_cny = df[df["currency"].str.contains("人民币|CNY", case=False, na=False)]
+    if usd_cny.empty:
+        usd_cny = df[df["currency"].str.contains("美元|USD", case=False, na=False)]
+    if usd_cny.empty:
+        return EMPTY
+    return pd.DataFrame({"date": [pd.Timestamp.now()], "value": [usd_cny.iloc[0]["rate"]]})
+
+
+def erp_frame(pe_df: pd.DataFrame, bond_df: pd.DataFrame) -> pd.DataFrame:
+    pe = pd.DataFrame({
+        "date": pd.to_datetime(pe_df["date"]),
+        "middlePETTM": pd.to_numeric(pe_df["middlePETTM"], errors="coerce"),
+    })
+    bond = pd.DataFrame({
+        "date": pd.to_datetime(bond_df["日期"]),
+        "bond_10y": pd.to_numeric(bond_df["中国国债收益率10年"], errors="coerce"),
+    })
+    merged = pd.merge_asof(pe.sort_values("date"), bond.sort_values("date"), on="date", direction="nearest")
+    merged["value"] = (1 / merged["middlePETTM"] * 100) - merged["bond_10y"]
+    return merged
+
+
+INDICATORS = [
+    IndicatorSpec(
+        code="gdp", name="国内生产总值(GDP)", category="经济增长", unit="%",
+        description="季度GDP同比增长率", update_frequency="季度",
+        sources=("macro_china_gdp",), date_column="季度", value_column="国内生产总值-同比增长",
+        date_format="period", drop_future=True,
+    ),
+    IndicatorSpec(
+        code="cpi", name="居民消费价格指数(CPI)", category="物价水平", unit="%",
+        description="同比 CPI 涨跌幅", update_frequency="月度",
+        sources=("macro_china_cpi",), date_column="月份", value_column="全国-同比增长",
+        date_format="period", drop_future=True,
+    ),
+    IndicatorSpec(
+        code="pmi", name="采购经理指数(PMI)", category="经济景气", unit="",
+        description="制造业PMI指数", update_frequency="月度",
+        sources=("macro_china_pmi",), date_column="月份", value_column="制造业-指数",
+        date_format="period", drop_future=True,
+    ),
+    IndicatorSpec(
+        code="ppi", name="工业生产者出厂价格指数(PPI)", category="物价水平", unit="%",
+        description="同比PPI涨跌幅", update_frequency="月度",
+        sources=("macro_china_ppi",), date_column="月份", value_column="当月同比增长",
+        date_format="period", drop_future=True,
+    ),
+    IndicatorSpec(
+        code="m2", name="广义货币(M2)", category="货币金融", unit="万亿元",
+        description="M2货币供应量", update_frequency="月度",
+        sources=("macro_china_m2_year",), transform=m2_frame,
+    ),
+    IndicatorSpec(
+        code="rate", name="LPR利率(1年期)", category="货币金融", unit="%",
+        description="贷款市场报价利率(LPR)1年期", update_frequency="月度",
+        sources=("macro_china_lpr",), date_column="TRADE_DATE", value_column="LPR1Y",
+    ),
+    IndicatorSpec(
+        code="exchange", name="人民币汇率", category="国际收支", unit="",
+        description="美元兑人民币汇率", update_frequency="日度",
+        sources=("currency_latest",), transform=exchange_frame,
+    ),
+    IndicatorSpec(
+        code="erp", name="股权风险溢价(ERP)", category="市场估值", unit="%",
+        description="A股ERP = 1/PE(TTM) - 10年期国债收益率", update_frequency="日度",
+        sources=("stock_a_ttm_lyr", "bond_zh_us_rate"), transform=erp_frame,
+    ),
+]
+
+
+class IndicatorRegistry:
+    def __init__(self, specs: List[IndicatorSpec]):
+        self._specs: Dict[str, IndicatorSpec] = {}
+        for spec in specs:
+            if spec.code in self._specs:
+                raise ValueError(f"Duplicate indicator code: {spec.code}")
+            self._specs[spec.code] = spec
+        self._infos = {code: spec.info() for code, spec in self._specs.items()}
+        self._info_list = list(self._infos.values())
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._specs
+
+    def __iter__(self) -> Iterator[IndicatorSpec]:
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def get(self, code: str) -> Optional[IndicatorSpec]:
+        return self._specs.get(code)
+
+    def info(self, code: str) -> Optional[Dict]:
+        return self._infos.get(code)
+
+    def infos(self) -> List[Dict]:
+        # Shared, precomputed metadata; callers must not mutate it.
+        return self._info_list
+
+
+indicator_registry = IndicatorRegistry(INDICATORS)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.executors import upstream_executor
+from app.services.data_fetcher import DataFetcher, data_fetcher, refresh_interval
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    def __init__(self, fetcher: DataFetcher):
+        self.fetcher = fetcher
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._status: Dict[str, Dict] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        for info in self.fetcher.get_available_indicators():
+            code = info["code"]
+            self._status[code] = {
+                "indicator_code": code,
+                "update_frequency": info["update_frequency"],
+                "interval_seconds": refresh_interval(info["update_frequency"]),
+                "last_refresh_at": None,
+                "last_success_at": None,
+                "duration_seconds": None,
+                "rows": None,
+                "error": None,
+                "consecutive_failures": 0,
+                "next_refresh_at": None,
+            }
+            self._tasks[code] = asyncio.create_task(self._run(code), name=f"refresh-{code}")
+        logger.info(f"Started refresh scheduler for {len(self._tasks)} indicators")
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_status(self) -> List[Dict]:
+        return [dict(status) for status in self._status.values()]
+
+    def _next_delay(self, code: str) -> float:
+        status = self._status[code]
+        failures = status["consecutive_failures"]
+        if failures:
+            backoff = min(settings.refresh_backoff_base * 2 ** (failures - 1), settings.refresh_backoff_max)
+            return backoff * random.uniform(0.5, 1.0)
+        interval = status["interval_seconds"]
+        jitter = interval * settings.refresh_jitter
+        return interval + random.uniform(-jitter, jitter)
+
+    def _last_fetched(self, code: str) -> Optional[datetime]:
+        fetched_at = self.fetcher.fetched_at(code)
+        if fetched_at is not None:
+            return fetched_at
+        try:
+            return self.fetcher.storage.fetched_at(code)
+        except Exception as e:
+            logger.warning(f"Could not read last fetch time of {code}: {e}")
+            return None
+
+    async def _first_delay(self, code: str) -> float:
+        # After a restart, series fetched recently are not due yet; only those
+        # never fetched or past their interval refresh right away. Either way
+        # the first round is staggered so indicators don't all hit akshare at once.
+        stagger = random.uniform(0, settings.refresh_initial_delay)
+        fetched_at = await upstream_executor.run(self._last_fetched, code)
+        if fetched_at is None:
+            return stagger
+        due_at = fetched_at + timedelta(seconds=self._status[code]["interval_seconds"])
+        return max((due_at - datetime.now()).total_seconds(), 0.0) + stagger
+
+    async def _run(self, code: str):
+        delay = await self._first_delay(code)
+        while True:
+            self._status[code]["next_refresh_at"] = datetime.fromtimestamp(time.time() + delay)
+            await asyncio.sleep(delay)
+            await self.refresh(code)
+            delay = self._next_delay(code)
+
+    async def refresh(self, code: str) -> bool:
+        status = self._status.setdefault(code, {"indicator_code": code, "consecutive_failures": 0})
+        started_at = datetime.now()
+        started = time.perf_counter()
+        error = None
+        rows = 0
+        try:
+            df = await upstream_executor.run(self.fetcher.fetch_indicator_data, code, True)
+            rows = len(df)
+            if df.empty:
+                error = "upstream returned no data"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        status["last_refresh_at"] = started_at
+        status["duration_seconds"] = round(time.perf_counter() - started, 3)
+        status["rows"] = rows
+        status["error"] = error
+        if error is None:
+            status["last_success_at"] = started_at
+            status["consecutive_failures"] = 0
+        else:
+            status["consecutive_failures"] += 1
+            logger.warning(f"Scheduled refresh of {code} failed ({status['consecutive_failures']} in a row): {error}")
+        return error is None
+
+
+refresh_scheduler = RefreshScheduler(data_fetcher)
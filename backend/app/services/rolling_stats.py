@@ -0,0 +1,91 @@
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+MA_WINDOWS = (7, 30)
+TAIL_SIZE = max(MA_WINDOWS)
+
+
+class RollingStats:
+    # Running statistics of one stored series (newest first). The calculator's
+    # list methods read the end of that list, so `tail` keeps its last
+    # TAIL_SIZE values and `window_sums` the sums of its last 7/30 values.
+    # Newer points are pushed on the front: they update the Welford moments
+    # and only reach the tail while the series is shorter than TAIL_SIZE.
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.latest: Optional[float] = None
+        self.latest_date: Optional[pd.Timestamp] = None
+        self.oldest_date: Optional[pd.Timestamp] = None
+        self.tail: deque = deque(maxlen=TAIL_SIZE)
+        self.window_sums: Dict[int, float] = {window: 0.0 for window in MA_WINDOWS}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "RollingStats":
+        stats = cls()
+        values = df["value"].to_numpy(dtype=float)
+        if not len(values):
+            return stats
+        stats.count = len(values)
+        stats.mean = float(values.mean())
+        stats.m2 = float(((values - stats.mean) ** 2).sum())
+        stats.latest = float(values[0])
+        stats.latest_date = df["date"].iloc[0]
+        stats.oldest_date = df["date"].iloc[-1]
+        stats.tail.extend(values[-TAIL_SIZE:].tolist())
+        stats.window_sums = {window: float(values[-window:].sum()) for window in MA_WINDOWS}
+        return stats
+
+    def copy(self) -> "RollingStats":
+        other = RollingStats()
+        other.__dict__.update(self.__dict__)
+        other.tail = deque(self.tail, maxlen=TAIL_SIZE)
+        other.window_sums = dict(self.window_sums)
+        return other
+
+    def push_newest(self, date: pd.Timestamp, value: float):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if len(self.tail) < TAIL_SIZE:
+            self.tail.appendleft(value)
+        for window in MA_WINDOWS:
+            if self.count <= window:
+                self.window_sums[window] += value
+        self.latest = value
+        self.latest_date = date
+        if self.oldest_date is None:
+            self.oldest_date = date
+
+    def ma(self, window: int) -> Optional[float]:
+        if self.count < window:
+            return None
+        if window in self.window_sums:
+            return self.window_sums[window] / window
+        if window <= TAIL_SIZE:
+            return float(np.mean(list(self.tail)[-window:]))
+        return None
+
+    def volatility(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / self.count)
+
+
+def updated_stats(stats: RollingStats, df: pd.DataFrame, added: int) -> RollingStats:
+    # Returns new stats for `df`, which is the series `stats` were built from
+    # with `added` newer rows in front. The old object is left untouched so
+    # readers on other threads never see a half-applied update.
+    updated = stats.copy()
+    dates = df["date"].iloc[:added].tolist()
+    values = df["value"].iloc[:added].tolist()
+    for date, value in zip(reversed(dates), reversed(values)):
+        updated.push_newest(date, value)
+    return updated
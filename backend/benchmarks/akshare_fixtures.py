@@ -0,0 +1,147 @@
+"""Offline stand-ins for the akshare functions used by data_fetcher.
+
+Frames have the column names and value formats akshare returns (Chinese
+quarter/month labels, string dates), with row counts taken from real
+responses. `scale` tiles each series to simulate much longer histories.
+"""
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+END = pd.Timestamp("2024-06-30")
+
+# Approximate row counts of real responses.
+RECORDED_ROWS = {
+    "macro_china_gdp": 130,
+    "macro_china_cpi": 210,
+    "macro_china_pmi": 200,
+    "macro_china_ppi": 220,
+    "macro_china_m2_year": 330,
+    "macro_china_lpr": 130,
+    "currency_latest": 160,
+    "stock_a_ttm_lyr": 4600,
+    "bond_zh_us_rate": 8500,
+}
+
+
+def _tile(labels: np.ndarray, rows: int) -> np.ndarray:
+    # Long synthetic histories repeat the recorded span instead of running
+    # back past year 1.
+    return np.resize(labels, rows)
+
+
+def quarter_labels(rows: int) -> np.ndarray:
+    suffixes = ["第1-4季度", "第1-3季度", "第1-2季度", "第1季度"]
+    span = [f"{year}年{suffix}" for year in range(END.year - 1, 1991, -1) for suffix in suffixes]
+    return _tile(np.array([f"{END.year}年第1季度"] + span), rows)
+
+
+def month_labels(rows: int) -> np.ndarray:
+    months = pd.date_range(end=END, periods=min(rows, 400), freq="MS")[::-1]
+    return _tile(np.array([f"{m.year}年{m.month:02d}月份" for m in months]), rows)
+
+
+def trading_days(rows: int) -> pd.DatetimeIndex:
+    days = pd.bdate_range(end=END, periods=min(rows, 9000))
+    return pd.DatetimeIndex(_tile(days.to_numpy(), rows))
+
+
+def make_frames(scale: int = 1, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+
+    def rows(name: str) -> int:
+        return RECORDED_ROWS[name] * scale
+
+    def walk(n: int, start: float, step: float) -> np.ndarray:
+        return np.round(start + np.cumsum(rng.normal(0, step, n)), 2)
+
+    n = rows("macro_china_gdp")
+    gdp = pd.DataFrame({
+        "季度": quarter_labels(n),
+        "国内生产总值-绝对值": walk(n, 300000, 5000),
+        "国内生产总值-同比增长": walk(n, 6.0, 0.5),
+        "第一产业-绝对值": walk(n, 20000, 500),
+        "第一产业-同比增长": walk(n, 3.5, 0.3),
+    })
+
+    def monthly(name: str, columns: Dict[str, float]) -> pd.DataFrame:
+        n = rows(name)
+        frame = pd.DataFrame({"月份": month_labels(n)})
+        for column, start in columns.items():
+            frame[column] = walk(n, start, 0.3)
+        return frame
+
+    cpi = monthly("macro_china_cpi", {"全国-当月": 100.5, "全国-同比增长": 1.5, "全国-环比增长": 0.1, "全国-累计": 101.0})
+    pmi = monthly("macro_china_pmi", {"制造业-指数": 50.0, "制造业-同比增长": 0.5, "非制造业-指数": 52.0})
+    ppi = monthly("macro_china_ppi", {"当月": 99.0, "当月同比增长": -1.0, "累计": 98.5})
+
+    n = rows("macro_china_m2_year")
+    m2 = pd.DataFrame({
+        "商品": "中国M2货币供应年率",
+        "日期": _tile(pd.date_range(end=END, periods=min(n, 400), freq="MS").strftime("%Y-%m-%d").to_numpy(), n),
+        "今值": walk(n, 9.0, 0.3),
+        "预测值": np.nan,
+        "前值": walk(n, 9.0, 0.3),
+    })
+
+    n = rows("macro_china_lpr")
+    lpr = pd.DataFrame({
+        "TRADE_DATE": trading_days(n).strftime("%Y-%m-%d"),
+        "LPR1Y": walk(n, 4.0, 0.05),
+        "LPR5Y": walk(n, 4.6, 0.05),
+        "RATE_1": walk(n, 4.35, 0.05),
+        "RATE_2": walk(n, 4.9, 0.05),
+    })
+
+    n = rows("currency_latest")
+    currency = pd.DataFrame({
+        "currency": np.resize(np.array(["美元/人民币(USD/CNY)", "欧元/美元(EUR/USD)", "日元(JPY)", "英镑(GBP)"]), n),
+        "date": END.strftime("%Y-%m-%d"),
+        "base": "USD",
+        "rate": np.round(rng.uniform(0.5, 8.0, n), 4),
+    })
+
+    n = rows("stock_a_ttm_lyr")
+    pe = pd.DataFrame({
+        "date": trading_days(n).strftime("%Y-%m-%d"),
+        "middlePETTM": np.abs(walk(n, 30.0, 0.4)) + 5,
+        "averagePETTM": np.abs(walk(n, 35.0, 0.4)) + 5,
+        "middlePELYR": np.abs(walk(n, 32.0, 0.4)) + 5,
+        "averagePELYR": np.abs(walk(n, 36.0, 0.4)) + 5,
+        "close": walk(n, 3000.0, 20.0),
+    })
+
+    n = rows("bond_zh_us_rate")
+    bond = pd.DataFrame({
+        "日期": trading_days(n).strftime("%Y-%m-%d"),
+        "中国国债收益率2年": walk(n, 2.5, 0.02),
+        "中国国债收益率5年": walk(n, 2.8, 0.02),
+        "中国国债收益率10年": walk(n, 3.0, 0.02),
+        "中国国债收益率30年": walk(n, 3.5, 0.02),
+        "美国国债收益率10年": walk(n, 3.0, 0.03),
+    })
+
+    return {
+        "macro_china_gdp": gdp,
+        "macro_china_cpi": cpi,
+        "macro_china_pmi": pmi,
+        "macro_china_ppi": ppi,
+        "macro_china_m2_year": m2,
+        "macro_china_lpr": lpr,
+        "currency_latest": currency,
+        "stock_a_ttm_lyr": pe,
+        "bond_zh_us_rate": bond,
+    }
+
+
+def make_fake_akshare(frames: Dict[str, pd.DataFrame], wrap: Callable = None) -> SimpleNamespace:
+    # Each call returns a fresh copy, since the fetch_* methods mutate their input.
+    def endpoint(name: str):
+        def call(*args, **kwargs) -> pd.DataFrame:
+            return frames[name].copy()
+        call.__name__ = name
+        return wrap(name, call) if wrap else call
+
+    return SimpleNamespace(**{name: endpoint(name) for name in frames})
@@ -0,0 +1,51 @@
+"""Compare load time and on-disk size of the JSON and NumPy cache formats.
+
+Run from the backend directory:
+
+    python benchmarks/bench_cache_storage.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.cache_storage import JsonCacheStorage, NumpyCacheStorage
+
+SIZES = [1_000, 10_000, 100_000]
+REPEAT = 5
+
+
+def make_series(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(end="2024-12-31", periods=n, freq="D")[::-1]
+    return pd.DataFrame({"date": dates, "value": rng.normal(3.0, 1.5, n)})
+
+
+def bench(storage, df: pd.DataFrame):
+    storage.save("bench", df)
+    size = storage.path("bench").stat().st_size
+    # Touch every value so memory-mapped loads pay for the page faults too.
+    load = lambda: float(storage.load("bench")["value"].sum())
+    seconds = min(timeit.repeat(load, number=1, repeat=REPEAT))
+    return seconds, size
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        storages = {"json": JsonCacheStorage(tmp), "npy": NumpyCacheStorage(tmp)}
+        print(f"{'rows':>8} {'format':>6} {'load ms':>10} {'size KiB':>10} {'speedup':>8}")
+        for n in SIZES:
+            df = make_series(n)
+            results = {name: bench(storage, df) for name, storage in storages.items()}
+            base = results["json"][0]
+            for name, (seconds, size) in results.items():
+                print(f"{n:>8} {name:>6} {seconds * 1000:>10.3f} {size / 1024:>10.1f} {base / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
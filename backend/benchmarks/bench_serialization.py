@@ -0,0 +1,63 @@
+"""Compare the per-row Pydantic path of /api/indicators/{code}/data with the
+vectorized encoder across series sizes.
+
+Run from the backend directory:
+
+    python benchmarks/bench_serialization.py
+"""
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.encoders import encode_with_points
+from app.schemas.indicator import IndicatorDataPoint, IndicatorDataResponse
+
+SIZES = [100, 1_000, 10_000, 100_000]
+PAYLOAD = {
+    "indicator_code": "erp",
+    "indicator_name": "股权风险溢价(ERP)",
+    "unit": "%",
+    "latest_value": 1.0,
+    "change_percent": 0.5,
+    "fetched_at": None,
+    "age_seconds": None,
+    "is_stale": False,
+}
+
+
+def make_series(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(end="2024-12-31", periods=n, freq="D")[::-1]
+    return pd.DataFrame({"date": dates, "value": rng.normal(3.0, 1.5, n)})
+
+
+def per_row(df: pd.DataFrame) -> bytes:
+    points = [IndicatorDataPoint(date=row["date"], value=float(row["value"])) for _, row in df.iterrows()]
+    response = IndicatorDataResponse(data=points, **PAYLOAD)
+    body = jsonable_encoder(response)
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def vectorized(df: pd.DataFrame) -> bytes:
+    return encode_with_points(PAYLOAD, "data", df["date"], df["value"])
+
+
+def main():
+    print(f"{'rows':>8} {'per-row ms':>12} {'vectorized ms':>14} {'speedup':>8}")
+    for n in SIZES:
+        df = make_series(n)
+        repeat = 3 if n >= 100_000 else 7
+        slow = min(timeit.repeat(lambda: per_row(df), number=1, repeat=repeat))
+        fast = min(timeit.repeat(lambda: vectorized(df), number=1, repeat=repeat))
+        print(f"{n:>8} {slow * 1000:>12.2f} {fast * 1000:>14.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
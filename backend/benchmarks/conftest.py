@@ -0,0 +1,37 @@
+"""pytest-benchmark suite; runs offline against akshare_fixtures.
+
+Needs requirements-dev.txt. Run from the backend directory and save results
+(under .benchmarks/, keyed by commit) so later runs can be compared:
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+WORK_DIR = tempfile.mkdtemp(prefix="itrade-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORK_DIR}/bench.db"
+os.environ["REFRESH_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+
+from akshare_fixtures import make_fake_akshare, make_frames  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def akshare_frames():
+    return make_frames()
+
+
+@pytest.fixture
+def fake_akshare(monkeypatch, akshare_frames):
+    import app.services.data_fetcher as data_fetcher_module
+    fake = make_fake_akshare(akshare_frames)
+    monkeypatch.setattr(data_fetcher_module, "ak", fake)
+    return fake
@@ -0,0 +1,58 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from akshare_fixtures import make_fake_akshare
+import app.services.data_fetcher as data_fetcher_module
+
+
+@pytest.fixture(scope="module")
+def client(akshare_frames):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(data_fetcher_module, "ak", make_fake_akshare(akshare_frames))
+        from app.main import app
+        with TestClient(app) as client:
+            # Warm the caches; the cold upstream path is measured separately.
+            assert client.get("/api/dashboard/summary").status_code == 200
+            yield client
+
+
+@pytest.mark.parametrize("fmt", ["json", "columnar", "binary"])
+@pytest.mark.parametrize("code", ["cpi", "erp"])
+def test_get_data(benchmark, client, code, fmt):
+    benchmark.group = f"api-data-{code}"
+    response = benchmark(client.get, f"/api/indicators/{code}/data", params={"format": fmt})
+    assert response.status_code == 200
+
+
+def test_get_data_force_update(benchmark, client):
+    benchmark.group = "api-data-erp"
+    response = benchmark(client.get, "/api/indicators/erp/data", params={"force_update": "true"})
+    assert response.status_code == 200
+
+
+def test_get_data_not_modified(benchmark, client):
+    etag = client.get("/api/indicators/erp/data").headers["etag"]
+    benchmark.group = "api-data-erp"
+    response = benchmark(client.get, "/api/indicators/erp/data", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize("code", ["gdp", "erp"])
+def test_get_trend(benchmark, client, code):
+    benchmark.group = "api-trend"
+    response = benchmark(client.get, f"/api/indicators/{code}/trend")
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("fmt", ["json", "columnar"])
+def test_compare(benchmark, client, fmt):
+    body = {"codes": ["cpi", "ppi", "erp"], "start_date": "2015-01-01", "format": fmt}
+    benchmark.group = "api-compare"
+    response = benchmark(client.post, "/api/indicators/compare", json=body)
+    assert response.status_code == 200
+
+
+def test_dashboard_summary(benchmark, client):
+    benchmark.group = "api-dashboard"
+    response = benchmark(client.get, "/api/dashboard/summary")
+    assert response.status_code == 200
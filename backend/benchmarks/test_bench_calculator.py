@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_fetcher import SeriesUpdate, data_fetcher
+from app.services.indicator_calculator import indicator_calculator
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+LIST_METHODS = ["calculate_ma", "calculate_change_percent", "analyze_trend", "simple_prediction", "calculate_volatility"]
+
+
+def make_series(n: int) -> pd.DataFrame:
+    dates = pd.date_range(end="2024-06-30", periods=n, freq="min")[::-1]
+    values = 3.0 + np.cumsum(np.random.default_rng(n).normal(0, 0.05, n))
+    return pd.DataFrame({"date": dates, "value": values})
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("method", LIST_METHODS)
+def test_list_method(benchmark, method, size):
+    values = make_series(size)["value"].tolist()
+    benchmark.group = method
+    benchmark(getattr(indicator_calculator, method), values)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_trend_from_frame(benchmark, size):
+    df = make_series(size)
+    benchmark.group = "trend_from_frame"
+    benchmark(indicator_calculator.trend_from_frame, "bench", df)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_get_indicator_trend(benchmark, size):
+    # Served from the in-memory cache, so this measures the calculator path only.
+    data_fetcher._remember("bench_trend", make_series(size))
+    benchmark.group = "get_indicator_trend"
+    benchmark(indicator_calculator.get_indicator_trend, "bench_trend")
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("columnar", [False, True])
+def test_compare_indicators(benchmark, size, columnar):
+    codes = ["bench_a", "bench_b"]
+    for code in codes:
+        data_fetcher._remember(code, make_series(size))
+    benchmark.group = f"compare_indicators-{'columnar' if columnar else 'rows'}"
+    benchmark(indicator_calculator.compare_indicators, codes, None, None, columnar=columnar)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_rolling_stats_append(benchmark, size):
+    # One refresh adding a single newer point to an already summarized series.
+    full = make_series(size + 1)
+    previous = full.iloc[1:].reset_index(drop=True)
+    data_fetcher._remember("bench_append", previous)
+    indicator_calculator.trend_from_frame("bench_append", previous)
+    entry = indicator_calculator._stats["bench_append"]
+    data_fetcher._remember("bench_append", full)
+    update = SeriesUpdate(entry[0], data_fetcher.series_version("bench_append"), 1)
+
+    def append():
+        indicator_calculator._stats["bench_append"] = entry
+        indicator_calculator.on_series_updated("bench_append", previous, full, update)
+
+    benchmark.group = "rolling_stats_append"
+    benchmark(append)
+
+
+@pytest.mark.parametrize("size", [120, 1_000, 10_000])
+def test_analytics(benchmark, size):
+    from app.services.alignment import align_frames
+    from app.services.analytics import indicator_analytics
+
+    dates = pd.date_range(end="2024-06-30", periods=size, freq="D")[::-1]
+    rng = np.random.default_rng(size)
+    frames = {f"bench_{i}": pd.DataFrame({"date": dates, "value": rng.normal(size=size).cumsum()}) for i in range(6)}
+    benchmark.group = "analytics"
+    benchmark(lambda: indicator_analytics.analyze(align_frames(frames, "D"), "pearson", 12, 30))
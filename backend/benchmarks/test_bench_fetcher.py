@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from akshare_fixtures import make_fake_akshare, make_frames, month_labels, quarter_labels
+from app.models.db_setup import SessionLocal, init_db
+from app.services.cache_storage import JsonCacheStorage, NumpyCacheStorage, SqlCacheStorage
+from app.services.data_fetcher import DataFetcher
+import app.services.data_fetcher as data_fetcher_module
+
+FETCH_CODES = ["gdp", "cpi", "pmi", "ppi", "m2", "rate", "exchange", "erp"]
+PARSE_SIZES = [1_000, 10_000, 100_000]
+CACHE_SIZES = [1_000, 100_000]
+
+
+@pytest.fixture(scope="module")
+def fetcher(tmp_path_factory):
+    return DataFetcher(cache_dir=str(tmp_path_factory.mktemp("cache")),
+                       storage=NumpyCacheStorage(tmp_path_factory.mktemp("npy")))
+
+
+@pytest.mark.parametrize("size", PARSE_SIZES)
+@pytest.mark.parametrize("kind", ["quarter", "month"])
+def test_parse_chinese_date(benchmark, fetcher, kind, size):
+    labels = pd.Series(quarter_labels(size) if kind == "quarter" else month_labels(size))
+    benchmark.group = f"parse_chinese_date-{kind}-{size}"
+    result = benchmark(labels.apply, fetcher.parse_chinese_date)
+    assert result.notna().all()
+
+
+@pytest.mark.parametrize("size", PARSE_SIZES)
+@pytest.mark.parametrize("kind", ["quarter", "month"])
+def test_parse_chinese_dates(benchmark, fetcher, kind, size):
+    labels = pd.Series(quarter_labels(size) if kind == "quarter" else month_labels(size))
+    benchmark.group = f"parse_chinese_date-{kind}-{size}"
+    result = benchmark(fetcher.parse_chinese_dates, labels)
+    assert result.notna().all()
+
+
+@pytest.mark.parametrize("size", [1_000, 6_000])
+def test_parse_chinese_dates_unique_labels(benchmark, fetcher, size):
+    # Worst case for the lookup table: every label distinct.
+    months = pd.date_range("1700-01-01", periods=size, freq="MS")
+    labels = pd.Series([f"{m.year:04d}年{m.month:02d}月份" for m in months])
+    benchmark.group = f"parse_chinese_dates-unique-{size}"
+    result = benchmark(fetcher.parse_chinese_dates, labels)
+    assert result.notna().all()
+
+
+@pytest.mark.parametrize("scale", [1, 100])
+@pytest.mark.parametrize("code", FETCH_CODES)
+def test_fetch_pipeline(benchmark, monkeypatch, fetcher, code, scale):
+    monkeypatch.setattr(data_fetcher_module, "ak", make_fake_akshare(make_frames(scale)))
+    benchmark.group = f"fetch-{code}"
+    benchmark(fetcher.fetch_source_data, code)
+
+
+def make_series(n: int) -> pd.DataFrame:
+    dates = pd.date_range(end="2024-06-30", periods=n, freq="h")[::-1]
+    return pd.DataFrame({"date": dates, "value": np.random.default_rng(0).normal(3.0, 1.0, n)})
+
+
+@pytest.fixture(scope="module")
+def storages(tmp_path_factory):
+    init_db()
+    return {
+        "json": JsonCacheStorage(tmp_path_factory.mktemp("json")),
+        "npy": NumpyCacheStorage(tmp_path_factory.mktemp("npy")),
+        "sql": SqlCacheStorage(SessionLocal),
+    }
+
+
+@pytest.mark.parametrize("size", CACHE_SIZES)
+@pytest.mark.parametrize("fmt", ["json", "npy", "sql"])
+def test_cache_save(benchmark, storages, fmt, size):
+    storage, df, code = storages[fmt], make_series(size), f"bench_save_{size}"
+    benchmark.group = f"cache-save-{size}"
+    # SqlCacheStorage only inserts rows newer than what is stored, so start empty.
+    benchmark.pedantic(storage.save, args=(code, df), setup=lambda: storage.remove(code), rounds=5)
+
+
+@pytest.mark.parametrize("size", CACHE_SIZES)
+@pytest.mark.parametrize("fmt", ["json", "npy", "sql"])
+def test_cache_load(benchmark, storages, fmt, size):
+    storage, code = storages[fmt], f"bench_load_{size}"
+    storage.remove(code)
+    storage.save(code, make_series(size))
+    benchmark.group = f"cache-load-{size}"
+    df = benchmark(storage.load, code)
+    assert len(df) == size
@@ -0,0 +1,203 @@
+"""Replay a mix of dashboard, series, analytics and alert traffic and report
+throughput and latency percentiles per endpoint.
+
+Start the server first (loadtest/serve.py uses the fake akshare), then:
+
+    python loadtest/driver.py --users 50 --duration 60 --auth-fraction 0.2
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+CODES = ["gdp", "cpi", "pmi", "ppi", "rate", "erp"]
+FORMATS = ["json", "columnar", "binary"]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name: str, seconds: float, status: Optional[int], ok: bool):
+        self.latencies[name].append(seconds)
+        if status is not None:
+            self.statuses[name][status] += 1
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> List[Dict]:
+        rows = []
+        names = sorted(self.latencies, key=lambda name: -len(self.latencies[name]))
+        for name in names + ["TOTAL"]:
+            samples = np.array(sum(self.latencies.values(), []) if name == "TOTAL" else self.latencies[name]) * 1000
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]) if len(samples) else (0, 0, 0)
+            rows.append({
+                "endpoint": name,
+                "requests": len(samples),
+                "errors": sum(self.errors.values()) if name == "TOTAL" else self.errors[name],
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(float(p50), 1),
+                "p95_ms": round(float(p95), 1),
+                "p99_ms": round(float(p99), 1),
+                "max_ms": round(float(samples.max()), 1) if len(samples) else 0,
+                "statuses": dict(self.statuses[name]) if name != "TOTAL" else None,
+            })
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, rng: random.Random, think_time: float,
+                 authenticated: bool, run_id: str, index: int):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+        self.authenticated = authenticated
+        self.username = f"load_{run_id}_{index}"
+        self.headers: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+        self.alert_ids: List[int] = []
+
+    async def request(self, name: str, method: str, url: str, ok_statuses=(200, 304), **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(name, time.perf_counter() - started, None, False)
+            return None
+        self.stats.record(name, time.perf_counter() - started, response.status_code,
+                          response.status_code in ok_statuses)
+        return response
+
+    async def conditional_get(self, name: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        # Revisit with If-None-Match, as a browser would.
+        key = url + json.dumps(kwargs.get("params", {}), sort_keys=True)
+        headers = {"If-None-Match": self.etags[key]} if key in self.etags else {}
+        response = await self.request(name, "GET", url, headers=headers, **kwargs)
+        if response is not None and "etag" in response.headers:
+            self.etags[key] = response.headers["etag"]
+        return response
+
+    async def login(self):
+        credentials = {"username": self.username, "password": "loadtest-password"}
+        await self.request("POST /api/auth/register", "POST", "/api/auth/register",
+                           json={**credentials, "email": f"{self.username}@loadtest.local"})
+        response = await self.request("POST /api/auth/login", "POST", "/api/auth/login", data=credentials)
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def dashboard(self):
+        await self.request("GET /api/indicators", "GET", "/api/indicators")
+        await self.conditional_get("GET /api/dashboard/summary", "/api/dashboard/summary")
+
+    async def series(self):
+        code = self.rng.choice(CODES)
+        await self.conditional_get("GET /api/indicators/{code}/data", f"/api/indicators/{code}/data",
+                                   params={"format": self.rng.choice(FORMATS)})
+
+    async def trend(self):
+        code = self.rng.choice(CODES)
+        await self.request("GET /api/indicators/{code}/trend", "GET", f"/api/indicators/{code}/trend")
+
+    async def compare(self):
+        body = {"codes": self.rng.sample(CODES, 3), "start_date": "2018-01-01",
+                "format": self.rng.choice(["json", "columnar"])}
+        await self.request("POST /api/indicators/compare", "POST", "/api/indicators/compare", json=body)
+
+    async def analytics(self):
+        # A few fixed code sets, so users revisit summaries with If-None-Match.
+        codes = sorted(self.rng.sample(CODES[:4], self.rng.choice([2, 3])))
+        body = {"codes": codes, "freq": self.rng.choice(["M", "Q"]), "method": self.rng.choice(["pearson", "spearman"])}
+        key = "analytics" + json.dumps(body, sort_keys=True)
+        headers = {"If-None-Match": self.etags[key]} if key in self.etags else {}
+        response = await self.request("POST /api/indicators/analytics", "POST", "/api/indicators/analytics",
+                                      json=body, headers=headers)
+        if response is not None and "etag" in response.headers:
+            self.etags[key] = response.headers["etag"]
+
+    async def alerts(self):
+        if not self.headers:
+            return
+        h = self.headers
+        if len(self.alert_ids) < 5:
+            body = {"indicator_code": self.rng.choice(CODES), "condition": self.rng.choice(["above", "below"]),
+                    "threshold": round(self.rng.uniform(-2, 60), 2)}
+            response = await self.request("POST /api/alerts", "POST", "/api/alerts", json=body, headers=h)
+            if response is not None and response.status_code == 200:
+                self.alert_ids.append(response.json()["id"])
+        await self.request("GET /api/alerts", "GET", "/api/alerts", headers=h)
+        await self.request("GET /api/alerts/check", "GET", "/api/alerts/check", headers=h)
+        if self.alert_ids:
+            alert_id = self.rng.choice(self.alert_ids)
+            await self.request("PUT /api/alerts/{id}", "PUT", f"/api/alerts/{alert_id}", headers=h,
+                               json={"threshold": round(self.rng.uniform(-2, 60), 2)})
+            if self.rng.random() < 0.2:
+                self.alert_ids.remove(alert_id)
+                await self.request("DELETE /api/alerts/{id}", "DELETE", f"/api/alerts/{alert_id}", headers=h)
+
+    async def run(self, deadline: float):
+        if self.authenticated:
+            await self.login()
+        scenarios = [(self.dashboard, 3), (self.series, 5), (self.trend, 2), (self.compare, 1), (self.analytics, 1)]
+        if self.authenticated:
+            scenarios.append((self.alerts, 3))
+        actions, weights = zip(*scenarios)
+        while time.perf_counter() < deadline:
+            await self.rng.choices(actions, weights)[0]()
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time) if self.think_time > 0 else 0)
+
+
+def print_report(rows: List[Dict], elapsed: float):
+    print(f"\n{'endpoint':<36} {'reqs':>7} {'errs':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for row in rows:
+        print(f"{row['endpoint']:<36} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}")
+    print(f"\nelapsed {elapsed:.1f}s")
+
+
+async def main(args):
+    stats = Stats()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.users * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        auth_users = int(round(args.users * args.auth_fraction))
+        tasks = []
+        for i in range(args.users):
+            user = VirtualUser(client, stats, random.Random(args.seed + i), args.think_time,
+                               i < auth_users, run_id, i)
+            tasks.append(asyncio.create_task(user.run(deadline)))
+            if args.ramp_up:
+                await asyncio.sleep(args.ramp_up / args.users)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    rows = stats.report(elapsed)
+    print_report(rows, elapsed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "elapsed": elapsed, "endpoints": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean pause between actions")
+    parser.add_argument("--auth-fraction", type=float, default=0.2, help="share of users that log in and manage alerts")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    asyncio.run(main(parser.parse_args()))
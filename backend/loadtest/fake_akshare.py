@@ -0,0 +1,59 @@
+"""Local stand-in for the akshare functions data_fetcher calls.
+
+Serves the akshare-shaped frames from benchmarks/akshare_fixtures.py with
+configurable latency, error rate and series length (a multiple of the
+recorded row counts).
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from akshare_fixtures import make_fake_akshare, make_frames  # noqa: E402
+
+
+class UpstreamError(ConnectionError):
+    pass
+
+
+class FakeAkshare:
+    def __init__(self, latency: float = 0.2, jitter: float = 0.5, error_rate: float = 0.0,
+                 scale: int = 1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.scale = scale
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.module: SimpleNamespace = make_fake_akshare(make_frames(scale, seed), wrap=self._wrap)
+
+    def _wrap(self, name, call):
+        def endpoint(*args, **kwargs):
+            with self._lock:
+                self.calls[name] += 1
+                delay = self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+                failed = self._random.random() < self.error_rate
+            time.sleep(max(delay, 0.0))
+            if failed:
+                with self._lock:
+                    self.errors[name] += 1
+                raise UpstreamError(f"fake akshare: {name} failed")
+            return call(*args, **kwargs)
+        endpoint.__name__ = name
+        return endpoint
+
+    def install(self):
+        # data_fetcher resolves ak.<function> at call time.
+        import app.services.data_fetcher as data_fetcher_module
+        data_fetcher_module.ak = self.module
+
+    def stats(self):
+        with self._lock:
+            return {"calls": dict(self.calls), "errors": dict(self.errors)}
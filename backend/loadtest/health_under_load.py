@@ -0,0 +1,104 @@
+"""Measure /health latency while the upstream executor is saturated.
+
+Starts the app in-process with akshare replaced by a slow fake_akshare,
+records a /health baseline, then hammers force_update data requests and
+probes /health again. Run from the backend directory:
+
+    python loadtest/health_under_load.py --concurrency 200 --fetch-latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import numpy as np
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(tempfile.mkdtemp(prefix="itrade-loadtest-"))
+os.environ.setdefault("REFRESH_ENABLED", "false")
+
+from fake_akshare import FakeAkshare  # noqa: E402
+
+CODES = ["gdp", "cpi", "pmi", "ppi", "rate", "erp"]
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return f"n={len(samples)} p50={p50:.1f}ms p95={p95:.1f}ms p99={p99:.1f}ms max={max(samples) * 1000:.1f}ms"
+
+
+async def probe_health(client: httpx.AsyncClient, duration: float, interval: float):
+    samples = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def saturate(client: httpx.AsyncClient, stop: asyncio.Event, worker: int, counts: dict):
+    i = worker
+    while not stop.is_set():
+        code = CODES[i % len(CODES)]
+        i += 1
+        try:
+            response = await client.get(f"/api/indicators/{code}/data", params={"force_update": "true"})
+            counts[response.status_code] = counts.get(response.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            counts[type(e).__name__] = counts.get(type(e).__name__, 0) + 1
+
+
+async def main(args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        baseline = await probe_health(client, args.duration, args.interval)
+        print(f"/health idle:       {percentiles(baseline)}")
+
+        stop = asyncio.Event()
+        counts = {}
+        load = [asyncio.create_task(saturate(client, stop, i, counts)) for i in range(args.concurrency)]
+        await asyncio.sleep(args.fetch_latency)  # let the upstream queue fill
+        loaded = await probe_health(client, args.duration, args.interval)
+        stats = (await client.get("/api/executors/stats")).json()["items"]
+        stop.set()
+        await asyncio.gather(*load)
+
+        print(f"/health under load: {percentiles(loaded)}")
+        print(f"data responses:     {counts}")
+        for executor in stats:
+            print(f"executor {executor['name']}: queue_depth={executor['queue_depth']} "
+                  f"max_queue_depth={executor['max_queue_depth']} active={executor['active']}/{executor['max_workers']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--fetch-latency", type=float, default=1.0)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    FakeAkshare(latency=args.fetch_latency, jitter=0.0, scale=args.scale).install()
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.should_exit = True
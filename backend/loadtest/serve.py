@@ -0,0 +1,55 @@
+"""Run the API against the fake akshare for load testing.
+
+Run from the backend directory, then point loadtest/driver.py at it:
+
+    python loadtest/serve.py --latency 0.5 --error-rate 0.05 --scale 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import uvicorn
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "loadtest"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="mean upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency spread as a fraction of --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that raise")
+    parser.add_argument("--scale", type=int, default=1, help="series length as a multiple of real akshare responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--refresh", action="store_true", help="keep the background refresh scheduler running")
+    parser.add_argument("--work-dir", help="directory for the database and caches (default: a fresh temp dir)")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment first.
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="itrade-loadtest-")
+    os.makedirs(work_dir, exist_ok=True)
+    os.chdir(work_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(work_dir, 'itrade.db')}")
+    os.environ.setdefault("REFRESH_ENABLED", "true" if args.refresh else "false")
+
+    from fake_akshare import FakeAkshare
+
+    fake = FakeAkshare(args.latency, args.jitter, args.error_rate, args.scale, args.seed)
+    fake.install()
+
+    from app.main import app
+
+    print(f"fake akshare: latency={args.latency}s±{args.jitter:.0%} error_rate={args.error_rate} "
+          f"scale={args.scale}x, work dir {work_dir}")
+    try:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    finally:
+        print(f"upstream calls: {fake.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from app.services.alert_index import AlertIndex
+
+ALERTS = [
+    (1, 10, "above", 3.0),
+    (2, 10, "above", 6.0),
+    (3, 11, "below", 4.0),
+    (4, 11, "below", 7.0),
+    (5, 12, "equals", 7.0),
+]
+
+
+def make_index(rows=ALERTS):
+    return AlertIndex(lambda code: list(rows), equals_tolerance=0.01)
+
+
+def crossed_ids(index, previous, current):
+    return sorted(row[0] for row in index.crossed("cpi", previous, current))
+
+
+def test_without_previous_value_every_satisfied_alert_triggers():
+    assert crossed_ids(make_index(), None, 5.0) == [1, 4]
+
+
+def test_only_threshold_crossings_trigger():
+    index = make_index()
+    assert crossed_ids(index, 5.0, 7.0) == [2, 5]
+    assert crossed_ids(index, 7.0, 7.0) == []
+    assert crossed_ids(index, 7.0, 3.5) == [3, 4]
+    assert crossed_ids(index, 3.5, 2.0) == []
+
+
+def test_index_follows_alert_changes():
+    index = make_index()
+    assert crossed_ids(index, 5.0, 6.5) == [2]
+
+    index.upsert("cpi", (2, 10, "above", 6.6))
+    index.upsert("cpi", (6, 13, "above", 6.0))
+    index.remove("cpi", 1)
+    assert crossed_ids(index, 5.0, 6.5) == [6]
+    assert crossed_ids(index, 2.0, 6.5) == [6]
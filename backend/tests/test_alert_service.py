@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Alert, AlertEvent, Base
+from app.schemas.alert import AlertTrigger
+from app.services.alert_index import AlertIndex
+from app.services.alert_service import EQUALS_TOLERANCE, AlertService
+from app.services.cache_storage import SqlCacheStorage
+from app.services.data_fetcher import DataFetcher
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'alerts.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def service(session_factory):
+    with session_factory() as db:
+        alert = Alert(user_id=1, indicator_code="cpi", condition="above", threshold=5.0, is_active=True)
+        db.add(alert)
+        db.commit()
+        row = (alert.id, alert.user_id, alert.condition, alert.threshold)
+    service = AlertService()
+    service.index = AlertIndex(lambda code: [row] if code == "cpi" else [], EQUALS_TOLERANCE)
+    return service
+
+
+def cpi(latest):
+    return pd.DataFrame({"date": pd.to_datetime(["2024-02-01", "2024-01-01"]), "value": [latest, 1.0]})
+
+
+def test_revision_reloaded_from_storage_does_not_refire(tmp_path, session_factory, service):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=SqlCacheStorage(session_factory=session_factory))
+    upstream = {"df": cpi(2.0)}
+    fetcher.fetch_source_data = lambda code: upstream["df"].copy()
+
+    def evaluate(code, previous, df, update):
+        with session_factory() as db:
+            service.evaluate_indicator(db, code, previous, df)
+
+    fetcher.add_listener(evaluate)
+
+    fetcher.fetch_indicator_data("cpi", force_update=True)
+    upstream["df"] = cpi(9.9)  # upstream revises the latest point across the threshold
+    fetcher.fetch_indicator_data("cpi", force_update=True)
+
+    # Drop the in-memory copy so "previous" comes from storage, then refresh again.
+    fetcher.invalidate("cpi")
+    assert fetcher.get_cached("cpi")["value"].iloc[0] == 9.9
+    fetcher.invalidate("cpi")
+    fetcher.fetch_indicator_data("cpi", force_update=True)
+
+    with session_factory() as db:
+        events = db.query(AlertEvent).all()
+        assert [(e.current_value, e.threshold) for e in events] == [(9.9, 5.0)]
+
+
+def test_recorded_events_are_read_back_newest_first_and_after_since(session_factory, service):
+    with session_factory() as db:
+        service.evaluate_indicator(db, "cpi", cpi(2.0), cpi(6.0))
+        # Backdate the first event so the two never share a timestamp.
+        db.query(AlertEvent).update({AlertEvent.triggered_at: datetime(2024, 1, 1)})
+        db.commit()
+        service.evaluate_indicator(db, "cpi", cpi(6.0), cpi(7.0))
+        service.evaluate_indicator(db, "cpi", cpi(7.0), cpi(2.0))
+        service.evaluate_indicator(db, "cpi", cpi(2.0), cpi(7.0))
+        events = service.get_alert_events(db, user_id=1)
+        assert [e.current_value for e in events] == [7.0, 6.0]
+        assert events[0].id != events[1].id
+
+        triggers = [AlertTrigger.model_validate(e) for e in events]
+        assert triggers[0].alert_id == triggers[1].alert_id
+
+        newer = service.get_alert_events(db, user_id=1, since=events[1].triggered_at)
+        assert [e.id for e in newer] == [events[0].id]
+        assert service.get_alert_events(db, user_id=1, since=events[0].triggered_at) == []
+        assert service.get_alert_events(db, user_id=2) == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from app.services.alignment import AlignmentEngine, align_frames
+from app.services.data_fetcher import data_fetcher
+
+
+def frame(dates, values):
+    return pd.DataFrame({"date": pd.to_datetime(dates), "value": values})
+
+
+QUARTERLY = frame(["2024-06-30", "2024-03-31", "2023-12-31"], [5.0, 4.0, 3.0])
+MONTHLY = frame(["2024-05-01", "2024-04-01", "2024-03-01", "2024-02-01", "2024-01-01"], [50, 40, 30, 20, 10])
+DAILY = frame(["2024-03-20", "2024-03-05", "2024-02-10"], [3.0, 2.0, 1.0])
+
+
+def test_drop_keeps_common_periods_oldest_first():
+    block = align_frames({"m": MONTHLY, "d": DAILY}, "M")
+    assert block.labels == ["2024-02", "2024-03"]
+    assert block.values.tolist() == [[20.0, 1.0], [30.0, 3.0]]
+
+
+def test_mean_aggregation():
+    block = align_frames({"m": MONTHLY, "d": DAILY}, "M", how="mean")
+    assert block.values.tolist() == [[20.0, 1.0], [30.0, 2.5]]
+
+
+def test_ffill_carries_quarterly_values_across_months():
+    block = align_frames({"gdp": QUARTERLY, "cpi": MONTHLY}, "M", fill="ffill")
+    assert block.labels == ["2024-01", "2024-02", "2024-03", "2024-04", "2024-05", "2024-06"]
+    assert block.column("gdp").tolist() == [3.0, 3.0, 4.0, 4.0, 4.0, 5.0]
+    assert block.column("cpi").tolist() == [10, 20, 30, 40, 50, 50]
+
+
+def test_keep_leaves_gaps():
+    block = align_frames({"gdp": QUARTERLY, "cpi": MONTHLY}, "Q", fill="keep")
+    assert block.labels == ["2023Q4", "2024Q1", "2024Q2"]
+    assert np.isnan(block.column("cpi")[0]) and block.latest_value("cpi") == 50
+
+
+def test_engine_caches_per_series_version():
+    engine = AlignmentEngine()
+    data_fetcher._remember("align_a", MONTHLY)
+    data_fetcher._remember("align_b", DAILY)
+    try:
+        first = engine.aligned(["align_a", "align_b"], "M")
+        assert engine.aligned(["align_a", "align_b"], "M") is first
+        assert engine.aligned(["align_a", "align_b"], "Q") is not first
+
+        data_fetcher._remember("align_b", frame(["2024-04-02"], [9.0]))
+        updated = engine.aligned(["align_a", "align_b"], "M")
+        assert updated is not first and updated.labels == ["2024-04"]
+    finally:
+        data_fetcher.invalidate("align_a")
+        data_fetcher.invalidate("align_b")
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.alignment import align_frames
+from app.services.analytics import correlation_matrix, indicator_analytics, lagged_correlations, rolling_correlations
+
+
+def monthly(values, end="2024-06-01"):
+    dates = pd.date_range(end=end, periods=len(values), freq="MS")[::-1]
+    return pd.DataFrame({"date": dates, "value": list(values)[::-1]})
+
+
+def random_matrix(n=60, p=3, seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.normal(size=(n, p)).cumsum(axis=0)
+    matrix[:, 2] = np.round(matrix[:, 2])  # ties for spearman
+    return matrix
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_correlation_matrix_matches_pandas(method):
+    matrix = random_matrix()
+    expected = pd.DataFrame(matrix).corr(method=method).to_numpy()
+    np.testing.assert_allclose(correlation_matrix(matrix, method), expected, atol=1e-12)
+
+
+def test_lagged_correlations_shift_one_series():
+    matrix = random_matrix()
+    lagged = lagged_correlations(matrix, 3)
+    for lag in range(-3, 4):
+        x, y = (matrix[:len(matrix) - lag, 0], matrix[lag:, 1]) if lag >= 0 else (matrix[-lag:, 0], matrix[:lag, 1])
+        assert lagged[lag + 3, 0, 1] == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+
+def test_rolling_correlations_match_pandas():
+    matrix = random_matrix()
+    frame = pd.DataFrame(matrix)
+    result = rolling_correlations(matrix, 12, [(0, 1), (1, 2)])
+    np.testing.assert_allclose(result[:, 0], frame[0].rolling(12).corr(frame[1]).to_numpy()[11:], atol=1e-9)
+    np.testing.assert_allclose(result[:, 1], frame[1].rolling(12).corr(frame[2]).to_numpy()[11:], atol=1e-9)
+
+
+def test_analyze_finds_leading_indicator():
+    rng = np.random.default_rng(1)
+    base = rng.normal(size=80).cumsum()
+    frames = {"lead": monthly(base[2:]), "lag": monthly(base[:-2])}
+    result = indicator_analytics.analyze(align_frames(frames, "M"), max_lag=4, window=12)
+    assert result["observations"] == 78
+    assert result["lagged"]["pairs"][0]["best"] == {"lag": 2, "value": 1.0}
+    assert len(result["rolling"]["periods"]) == len(result["rolling"]["pairs"][0]["values"]) == 67
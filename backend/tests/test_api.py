@@ -0,0 +1,165 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.encoders import SERIES_BINARY_MEDIA_TYPE
+from app.core.cache import TTLCache
+from app.core.executors import EXECUTORS
+from app.main import app
+from app.services.cache_storage import NumpyCacheStorage
+from app.services.data_fetcher import data_fetcher
+from app.services.indicator_calculator import indicator_calculator
+
+
+@pytest.fixture
+def client():
+    # No lifespan: these tests only need the routes, not the database or scheduler.
+    return TestClient(app)
+
+
+def test_analytics_needs_two_distinct_codes(client):
+    response = client.post("/api/indicators/analytics", json={"codes": ["cpi", "cpi"]})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "At least two distinct indicators are required"
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    # Serve made-up series through the real data fetcher, with storage and
+    # caches kept to this test.
+    series = {
+        code: pd.DataFrame({"date": pd.date_range(end="2024-06-01", periods=24, freq="MS")[::-1],
+                            "value": [float(i + offset) for i in range(24)]})
+        for offset, code in enumerate(["cpi", "pmi"])
+    }
+    monkeypatch.setattr(data_fetcher, "storage", NumpyCacheStorage(tmp_path))
+    monkeypatch.setattr(data_fetcher, "indicator_cache", TTLCache(ttl=3600, max_entries=8))
+    monkeypatch.setattr(data_fetcher, "_versions", {})
+    monkeypatch.setattr(data_fetcher, "_fetched_at", {})
+    monkeypatch.setattr(data_fetcher, "fetch_source_data", lambda code: series[code].copy())
+    return series
+
+
+def test_series_etag_answers_304(client, upstream):
+    first = client.get("/api/indicators/cpi/data")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/api/indicators/cpi/data", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    other = client.get("/api/indicators/cpi/data", headers={"If-None-Match": 'W/"other"'})
+    assert other.status_code == 200
+
+
+def test_if_modified_since_answers_304(client, upstream):
+    last_modified = client.get("/api/indicators/cpi/data").headers["last-modified"]
+    assert client.get("/api/indicators/cpi/data", headers={"If-Modified-Since": last_modified}).status_code == 304
+    earlier = "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert client.get("/api/indicators/cpi/data", headers={"If-Modified-Since": earlier}).status_code == 200
+
+
+def test_etag_changes_after_refresh(client, upstream):
+    etag = client.get("/api/indicators/cpi/data").headers["etag"]
+    body = {"codes": ["cpi", "pmi"]}
+    analytics_etag = client.post("/api/indicators/analytics", json=body).headers["etag"]
+    assert client.post("/api/indicators/analytics", json=body,
+                       headers={"If-None-Match": analytics_etag}).status_code == 304
+
+    upstream["cpi"].loc[0, "value"] = 99.0
+    refreshed = client.get("/api/indicators/cpi/data", params={"force_update": True})
+    assert refreshed.status_code == 200 and refreshed.headers["etag"] != etag
+    assert client.get("/api/indicators/cpi/data", headers={"If-None-Match": etag}).status_code == 200
+    assert client.post("/api/indicators/analytics", json=body,
+                       headers={"If-None-Match": analytics_etag}).status_code == 200
+
+
+def test_dashboard_summary_keeps_order_and_isolates_failures(client, upstream, monkeypatch):
+    from app.api.routes import DASHBOARD_INDICATORS
+
+    def fetch(code):
+        # Earlier indicators answer last, so completion order is reversed.
+        time.sleep(0.02 * (len(DASHBOARD_INDICATORS) - DASHBOARD_INDICATORS.index(code)))
+        if code == "ppi":
+            raise RuntimeError("upstream down")
+        if code == "erp":
+            return pd.DataFrame()
+        return upstream["cpi"].copy()
+
+    monkeypatch.setattr(data_fetcher, "fetch_source_data", fetch)
+    response = client.get("/api/dashboard/summary")
+    assert response.status_code == 200
+    assert [item["code"] for item in response.json()] == DASHBOARD_INDICATORS
+    items = {item["code"]: item for item in response.json()}
+
+    for code in ("ppi", "erp"):
+        assert items[code]["trend"] == "no_data" and items[code]["value"] is None
+    for code in ("gdp", "cpi", "pmi", "rate"):
+        assert items[code]["value"] == upstream["cpi"]["value"].iloc[0]
+        assert items[code]["latest_date"] == "2024-06-01"
+
+
+def test_series_layouts_carry_the_same_points(client, upstream):
+    df = upstream["cpi"]
+    rows = client.get("/api/indicators/cpi/data").json()
+
+    columnar = client.get("/api/indicators/cpi/data", params={"format": "columnar"})
+    assert columnar.headers["content-type"] == "application/json"
+    body = columnar.json()
+    assert "data" not in body and body["latest_value"] == rows["latest_value"]
+    assert pd.to_datetime(body["dates"], unit="ms").tolist() == df["date"].tolist()
+    assert body["values"] == [point["value"] for point in rows["data"]]
+
+    binary = client.get("/api/indicators/cpi/data", params={"format": "binary"})
+    assert binary.headers["content-type"] == SERIES_BINARY_MEDIA_TYPE
+    n = int(binary.headers["x-series-length"])
+    assert n == len(df) and len(binary.content) == 16 * n
+    assert np.frombuffer(binary.content, dtype="<i8", count=n).tolist() == body["dates"]
+    assert np.frombuffer(binary.content, dtype="<f8", offset=8 * n).tolist() == body["values"]
+    assert float(binary.headers["x-latest-value"]) == rows["latest_value"]
+    assert float(binary.headers["x-change-percent"]) == rows["change_percent"]
+
+    # Each layout gets its own validator, so a cached JSON body is never
+    # revalidated as a binary one.
+    etags = {client.get("/api/indicators/cpi/data").headers["etag"], columnar.headers["etag"], binary.headers["etag"]}
+    assert len(etags) == 3
+
+
+def test_binary_layout_is_negotiated_by_accept(client, upstream):
+    response = client.get("/api/indicators/cpi/data", headers={"Accept": SERIES_BINARY_MEDIA_TYPE})
+    assert response.headers["content-type"] == SERIES_BINARY_MEDIA_TYPE
+    assert response.headers["vary"] == "Accept"
+    assert response.content == client.get("/api/indicators/cpi/data", params={"format": "binary"}).content
+
+
+def test_fetches_and_analytics_run_on_their_own_executors(client, upstream, monkeypatch):
+    threads = {}
+    fetch = data_fetcher.fetch_source_data
+    trend_from_frame = indicator_calculator.trend_from_frame
+
+    def recording_fetch(code):
+        threads["fetch"] = threading.current_thread().name
+        return fetch(code)
+
+    def recording_trend(code, df):
+        threads["trend"] = threading.current_thread().name
+        return trend_from_frame(code, df)
+
+    monkeypatch.setattr(data_fetcher, "fetch_source_data", recording_fetch)
+    monkeypatch.setattr(indicator_calculator, "trend_from_frame", recording_trend)
+    monkeypatch.setattr(indicator_calculator, "_trend_memo", {})
+    before = {executor.name: executor.stats()["completed"] for executor in EXECUTORS}
+
+    assert client.get("/api/indicators/cpi/trend").status_code == 200
+    assert threads["fetch"].startswith("upstream") and threads["trend"].startswith("compute")
+
+    items = client.get("/api/executors/stats").json()["items"]
+    assert [item["name"] for item in items] == ["upstream", "compute"]
+    for item in items:
+        assert item["completed"] > before[item["name"]]
+        assert item["queue_depth"] == 0 and item["active"] == 0
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=10, max_entries=4)
+    cache.set("a", 1)
+    clock[0] += 9.9
+    assert cache.get("a") == 1
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_peek_does_not_count_or_refresh(clock):
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.peek("a") == 1
+    cache.set("c", 3)
+    # peek left "a" least recently used, so it was evicted.
+    assert cache.peek("a") is None
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_stats_count_hits_misses_and_evictions(clock):
+    cache = TTLCache(ttl=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)  # evicts "a"
+    cache.get("a")  # miss
+    cache.get("b")  # hit
+    clock[0] += 10
+    cache.get("c")  # expired: miss
+    cache.invalidate("b")
+    assert cache.stats() == {
+        "size": 0,
+        "max_entries": 2,
+        "ttl": 10,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "hit_rate": pytest.approx(1 / 3),
+    }
@@ -0,0 +1,117 @@
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.services.cache_storage import CacheStorage, JsonCacheStorage, NumpyCacheStorage, SqlCacheStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    Base.metadata.create_all(engine)
+    return SqlCacheStorage(session_factory=sessionmaker(bind=engine))
+
+
+def series(dates, values):
+    return pd.DataFrame({"date": pd.to_datetime(dates), "value": values})
+
+
+def test_save_and_load_newest_first(storage):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        storage.save("cpi", series(["2024-03-01", "2024-01-01", "2024-02-01"], [3.0, 1.0, 2.0]))
+    df = storage.load("cpi")
+    assert df["date"].tolist() == list(pd.to_datetime(["2024-03-01", "2024-02-01", "2024-01-01"]))
+    assert df["value"].tolist() == [3.0, 2.0, 1.0]
+    assert storage.load("pmi") is None
+
+
+def test_load_range(storage):
+    storage.save("cpi", series(["2024-03-01", "2024-02-01", "2024-01-01"], [3.0, 2.0, 1.0]))
+    df = storage.load_range("cpi", datetime(2024, 1, 15), datetime(2024, 3, 1))
+    assert df["value"].tolist() == [3.0, 2.0]
+
+
+def test_incremental_append_keeps_existing_rows(storage):
+    storage.save("cpi", series(["2024-02-01", "2024-01-01"], [2.0, 1.0]))
+    storage.save("cpi", series(["2024-03-01", "2024-02-01", "2024-01-01"], [3.0, 2.0, 1.0]))
+    assert storage.load("cpi")["value"].tolist() == [3.0, 2.0, 1.0]
+
+
+def test_revised_values_are_persisted_and_reloaded(storage):
+    storage.save("cpi", series(["2024-02-01", "2024-01-01"], [2.0, 1.0]))
+    storage.save("cpi", series(["2024-03-01", "2024-02-01", "2024-01-01"], [3.0, 2.5, 1.0]))
+    assert storage.load("cpi")["value"].tolist() == [3.0, 2.5, 1.0]
+
+    # A revision of the latest stored point with no new dates.
+    storage.save("cpi", series(["2024-03-01"], [3.3]))
+    reloaded = storage.load("cpi")
+    assert reloaded["value"].tolist() == [3.3, 2.5, 1.0]
+    assert len(reloaded) == 3
+
+
+def test_save_only_reads_overlapping_rows(storage, monkeypatch):
+    dates = pd.date_range(end="2024-10-01", periods=10, freq="MS")[::-1]
+    storage.save("cpi", series(dates, [float(i) for i in range(10)]))
+
+    read = []
+    stored_points = storage._stored_points
+
+    def spy(db, code, since):
+        points = stored_points(db, code, since)
+        read.append(len(points[0]))
+        return points
+
+    monkeypatch.setattr(storage, "_stored_points", spy)
+    newer = series(["2024-11-01", "2024-10-01", "2024-09-01"], [-1.0, 0.0, 1.0])
+    storage.save("cpi", newer)
+    assert read == [2]
+    assert storage.load("cpi")["value"].tolist()[:3] == [-1.0, 0.0, 1.0]
+
+
+def test_revisions_fall_back_to_update_without_dialect_upserts(storage, monkeypatch):
+    monkeypatch.setattr(storage, "_dialect_insert", lambda db: None)
+    storage.save("cpi", series(["2024-02-01", "2024-01-01"], [2.0, 1.0]))
+    storage.save("cpi", series(["2024-03-01", "2024-02-01", "2024-01-01"], [3.0, 2.5, 1.0]))
+    assert storage.load("cpi")["value"].tolist() == [3.0, 2.5, 1.0]
+
+
+def test_numpy_round_trip_keeps_dates_and_nan(tmp_path):
+    storage = NumpyCacheStorage(tmp_path)
+    df = series(["2024-03-01 12:30", "2024-02-01 00:00", "1970-01-01 00:00"], [3.5, float("nan"), -1e300])
+    storage.save("cpi", df)
+    loaded = storage.load("cpi")
+    assert loaded["date"].dtype == "datetime64[ns]"
+    assert loaded["date"].tolist() == df["date"].tolist()
+    assert np.array_equal(loaded["value"].to_numpy(), df["value"].to_numpy(), equal_nan=True)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_numpy_round_trip_of_empty_frame(tmp_path):
+    storage = NumpyCacheStorage(tmp_path)
+    storage.save("cpi", series([], []))
+    loaded = storage.load("cpi")
+    assert loaded.empty and list(loaded.columns) == ["date", "value"]
+
+
+def test_json_cache_is_migrated_to_numpy_and_removed(tmp_path):
+    legacy = JsonCacheStorage(tmp_path)
+    legacy.save("cpi", series(["2024-02-01", "2024-01-01"], [2.0, 1.0]))
+    storage = NumpyCacheStorage(tmp_path, legacy=legacy)
+
+    df = storage.load("cpi")
+    assert df["date"].tolist() == list(pd.to_datetime(["2024-02-01", "2024-01-01"]))
+    assert df["value"].tolist() == [2.0, 1.0]
+    assert storage.exists("cpi") and not legacy.exists("cpi")
+    assert storage.load("pmi") is None
+
+
+def test_storage_base_class_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        CacheStorage(tmp_path)
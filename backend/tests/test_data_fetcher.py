@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pandas as pd
+
+from app.services.cache_storage import NumpyCacheStorage
+from app.services.data_fetcher import DataFetcher
+
+
+def test_concurrent_fetches_share_one_upstream_call(tmp_path):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    calls = []
+    calls_lock = threading.Lock()
+
+    def slow_fetch(code):
+        with calls_lock:
+            calls.append(1)
+        time.sleep(0.2)
+        return pd.DataFrame({"date": pd.to_datetime(["2024-02-01", "2024-01-01"]), "value": [0.7, 0.3]})
+
+    fetcher.fetch_source_data = slow_fetch
+
+    n_callers = 8
+    barrier = threading.Barrier(n_callers)
+    results = [None] * n_callers
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fetcher.fetch_indicator_data("cpi", force_update=True)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(df is results[0] for df in results)
+    assert results[0]["value"].tolist() == [0.7, 0.3]
+
+
+def test_failed_fetch_is_not_shared_with_later_callers(tmp_path):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    attempts = []
+
+    def flaky_fetch(code):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream unavailable")
+        return pd.DataFrame({"date": pd.to_datetime(["2024-01-01"]), "value": [50.1]})
+
+    fetcher.fetch_source_data = flaky_fetch
+
+    try:
+        fetcher.fetch_indicator_data("pmi", force_update=True)
+    except RuntimeError:
+        pass
+
+    df = fetcher.fetch_indicator_data("pmi", force_update=True)
+    assert len(attempts) == 2
+    assert df["value"].tolist() == [50.1]
+
+
+def test_frame_version_never_pairs_a_frame_with_a_newer_version(tmp_path, monkeypatch):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    old = pd.DataFrame({"date": pd.to_datetime(["2024-01-01"]), "value": [1.0]})
+    new = pd.DataFrame({"date": pd.to_datetime(["2024-02-01", "2024-01-01"]), "value": [2.0, 1.0]})
+    fetcher._remember("cpi", old)
+    old_version = fetcher.series_version("cpi")
+
+    peek = fetcher.indicator_cache.peek
+
+    def racing_peek(key):
+        # A refresh lands right after the cache is read.
+        entry = peek(key)
+        monkeypatch.setattr(fetcher.indicator_cache, "peek", peek)
+        fetcher._remember("cpi", new)
+        return entry
+
+    monkeypatch.setattr(fetcher.indicator_cache, "peek", racing_peek)
+    assert fetcher.frame_version("cpi", old) == old_version
+    assert fetcher.frame_version("cpi", new) == fetcher.series_version("cpi") != old_version
+
+    # The last known version survives eviction, so ETags stay stable.
+    fetcher.invalidate("cpi")
+    assert fetcher.frame_version("cpi", new) is None
+    assert fetcher.series_version("cpi") is not None
+
+
+def test_refresh_reports_appends_and_revisions(tmp_path):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    updates = []
+    fetcher.add_listener(lambda code, previous, df, update: updates.append(update))
+
+    def refresh(dates, values):
+        df = pd.DataFrame({"date": pd.to_datetime(dates), "value": values})
+        fetcher.fetch_source_data = lambda code: df
+        fetcher.fetch_indicator_data("cpi", force_update=True)
+
+    refresh(["2024-02-01", "2024-01-01"], [2.0, 1.0])
+    refresh(["2024-04-01", "2024-03-01", "2024-02-01", "2024-01-01"], [4.0, 3.0, 2.0, 1.0])
+    refresh(["2024-04-01", "2024-03-01", "2024-02-01", "2024-01-01"], [4.0, 3.0, 2.5, 1.0])
+    refresh(["2024-05-01", "2024-04-01", "2024-03-01", "2024-02-01", "2024-01-01"], [5.0, 4.0, 3.0, 2.5, 1.5])
+    refresh(["2024-05-01", "2024-04-01", "2024-03-01", "2024-02-01", "2024-01-01"], [5.0, 4.0, 3.0, 2.5, 1.5])
+
+    # First load, pure append, in-place revision, append plus revision; the
+    # unchanged last refresh notifies nobody.
+    assert [update.added for update in updates] == [None, 2, None, None]
+    assert updates[0].previous_version is None
+    for before, after in zip(updates, updates[1:]):
+        assert after.previous_version == before.version
+    assert updates[-1].version == fetcher.series_version("cpi")
+
+
+def test_stale_series_is_served_while_one_background_refresh_runs(tmp_path):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    stale = pd.DataFrame({"date": pd.to_datetime(["2024-01-01"]), "value": [1.0]})
+    fresh = pd.DataFrame({"date": pd.to_datetime(["2024-02-01", "2024-01-01"]), "value": [2.0, 1.0]})
+    fetcher._remember("cpi", stale)
+    fetcher._fetched_at["cpi"] = time.time() - 90 * 24 * 3600
+
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(code):
+        calls.append(code)
+        release.wait(5)
+        return fresh
+
+    fetcher.fetch_source_data = slow_fetch
+
+    results = []
+
+    def request():
+        df = fetcher.fetch_indicator_data("cpi")
+        results.append((df, fetcher.freshness("cpi", df)))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every caller got the stale copy at once, flagged as revalidating.
+    assert all(df is stale and meta["is_stale"] and meta["revalidating"] for df, meta in results)
+
+    release.set()
+    deadline = time.time() + 5
+    while fetcher.series_meta("cpi")["revalidating"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls == ["cpi"]
+    assert fetcher.fetch_indicator_data("cpi")["value"].tolist() == [2.0, 1.0]
+    meta = fetcher.series_meta("cpi")
+    assert not meta["is_stale"] and not meta["revalidating"]
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.api.encoders import encode_binary, encode_columnar, encode_with_points
+from app.schemas.indicator import IndicatorDataPoint, IndicatorDataResponse
+
+PAYLOAD = {
+    "indicator_code": "erp",
+    "indicator_name": "股权风险溢价(ERP)",
+    "unit": "%",
+    "latest_value": 1.0,
+    "change_percent": 0.5,
+    "fetched_at": datetime(2024, 6, 30, 8, 15, 0, 250000),
+    "age_seconds": 12.5,
+    "is_stale": False,
+}
+
+
+def make_series(dates, values):
+    return pd.DataFrame({"date": pd.to_datetime(dates, format="ISO8601"), "value": values})
+
+
+def per_row(df):
+    points = [IndicatorDataPoint(date=row["date"], value=float(row["value"])) for _, row in df.iterrows()]
+    return jsonable_encoder(IndicatorDataResponse(data=points, **PAYLOAD))
+
+
+@pytest.mark.parametrize("df", [
+    make_series([], []),
+    make_series(["2024-06-30", "2024-06-29 12:00:00", "2024-06-28 00:00:00.5"], [1.25, -0.0, 1e-7]),
+    make_series(pd.date_range(end="2024-12-31", periods=500, freq="D")[::-1],
+                np.random.default_rng(0).normal(3.0, 1.5, 500)),
+])
+def test_fast_encoder_matches_response_schema(df):
+    fast = json.loads(encode_with_points(PAYLOAD, "data", df["date"], df["value"]))
+    assert fast == per_row(df)
+
+
+SERIES = make_series(["2024-06-30", "2024-06-29 12:00:00", "1969-12-31 23:59:59.5"], [1.25, float("nan"), -3e-9])
+EPOCH_MS = [1719705600000, 1719662400000, -500]
+
+
+def test_columnar_layout_keeps_payload_and_splits_columns():
+    body = json.loads(encode_columnar(PAYLOAD, SERIES["date"].iloc[:1], SERIES["value"].iloc[:1]))
+    assert body == {**jsonable_encoder(PAYLOAD), "dates": [EPOCH_MS[0]], "values": [1.25]}
+
+    empty = json.loads(encode_columnar(PAYLOAD, SERIES["date"].iloc[:0], SERIES["value"].iloc[:0]))
+    assert empty["dates"] == [] and empty["values"] == []
+
+
+def test_columnar_layout_writes_nan_as_null():
+    body = json.loads(encode_columnar({}, SERIES["date"], SERIES["value"]))
+    assert body["dates"] == EPOCH_MS
+    assert body["values"] == [1.25, None, -3e-9]
+
+
+@pytest.mark.parametrize("n", [0, 1, 3])
+def test_binary_layout_decodes_to_dates_then_values(n):
+    content = encode_binary(SERIES["date"].iloc[:n], SERIES["value"].iloc[:n])
+    assert len(content) == 16 * n
+    dates = np.frombuffer(content, dtype="<i8", count=n)
+    values = np.frombuffer(content, dtype="<f8", offset=8 * n)
+    assert dates.tolist() == EPOCH_MS[:n]
+    np.testing.assert_array_equal(values, SERIES["value"].to_numpy()[:n])
+    assert pd.to_datetime(dates, unit="ms").tolist() == SERIES["date"].iloc[:n].tolist()
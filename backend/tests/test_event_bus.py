@@ -0,0 +1,105 @@
+import asyncio
+
+import pandas as pd
+from starlette.requests import Request
+
+from app.api import routes
+from app.services.cache_storage import NumpyCacheStorage
+from app.services.data_fetcher import DataFetcher
+from app.services.event_bus import EventBus
+
+
+def series(dates, values):
+    return pd.DataFrame({"date": pd.to_datetime(dates), "value": values})
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_publish_fans_out_to_matching_subscribers():
+    async def scenario():
+        bus = EventBus(max_queue=2)
+        bus.bind(asyncio.get_running_loop())
+        anonymous, alice, bob = bus.subscribe(), bus.subscribe(1), bus.subscribe(2)
+        bus.publish({"type": "indicator_updated"})
+        bus.publish({"type": "alert_triggered"}, user_id=1)
+        await asyncio.sleep(0)
+        return drain(anonymous), drain(alice), drain(bob)
+
+    anonymous, alice, bob = asyncio.run(scenario())
+    assert [e["type"] for e in anonymous] == ["indicator_updated"]
+    assert [e["type"] for e in alice] == ["indicator_updated", "alert_triggered"]
+    assert [e["type"] for e in bob] == ["indicator_updated"]
+
+
+def test_slow_subscriber_drops_oldest_events():
+    async def scenario():
+        bus = EventBus(max_queue=2)
+        bus.bind(asyncio.get_running_loop())
+        subscription = bus.subscribe()
+        for i in range(3):
+            bus.publish({"type": "indicator_updated", "n": i})
+        await asyncio.sleep(0)
+        return subscription
+
+    subscription = asyncio.run(scenario())
+    assert [e["n"] for e in drain(subscription)] == [1, 2] and subscription.dropped == 1
+
+
+def updates(tmp_path, previous, df):
+    # Run a refresh through a real fetcher, which decides append vs. revision.
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    if previous is not None:
+        fetcher._remember("cpi", previous)
+    fetcher.fetch_source_data = lambda code: df
+
+    async def scenario():
+        bus = EventBus()
+        bus.bind(asyncio.get_running_loop())
+        fetcher.add_listener(bus.on_series_updated)
+        subscription = bus.subscribe()
+        fetcher.fetch_indicator_data("cpi", force_update=True)
+        await asyncio.sleep(0)
+        return drain(subscription)
+
+    return asyncio.run(scenario())
+
+
+def test_append_sends_only_new_points(tmp_path):
+    previous = series(["2024-02-01", "2024-01-01"], [2.0, 1.0])
+    [event] = updates(tmp_path, previous, series(["2024-03-01", "2024-02-01", "2024-01-01"], [3.0, 2.0, 1.0]))
+    assert event["reset"] is False
+    assert event["points"] == [{"date": "2024-03-01T00:00:00", "value": 3.0}]
+    assert event["latest_value"] == 3.0
+
+
+def test_in_place_revision_asks_clients_to_refetch(tmp_path):
+    previous = series(["2024-02-01", "2024-01-01"], [2.0, 1.0])
+    [event] = updates(tmp_path, previous, series(["2024-02-01", "2024-01-01"], [2.0, 1.5]))
+    assert event["reset"] is True and event["points"] == []
+
+
+def test_first_load_is_a_reset(tmp_path):
+    [event] = updates(tmp_path, None, series(["2024-01-01"], [1.0]))
+    assert event["reset"] is True
+
+
+def test_stream_unsubscribes_when_the_client_disconnects(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(routes, "event_bus", bus)
+
+    async def scenario():
+        response = await routes.stream_events(Request({"type": "http", "headers": []}), token=None)
+        body = response.body_iterator
+        first = await body.__anext__()
+        subscribed = bus.subscriber_count
+        await body.aclose()
+        return first, subscribed
+
+    first, subscribed = asyncio.run(scenario())
+    assert first.startswith("retry:")
+    assert subscribed == 1 and bus.subscriber_count == 0
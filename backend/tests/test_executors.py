@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from app.core.executors import InstrumentedExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = InstrumentedExecutor("test", 1)
+    yield executor
+    executor._executor.shutdown(wait=True)
+
+
+def test_stats_track_queue_and_outcomes(executor):
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    def fail():
+        raise ValueError("boom")
+
+    first = executor.submit(blocker)
+    assert started.wait(5)
+    queued = [executor.submit(lambda: 1), executor.submit(fail)]
+    stats = executor.stats()
+    assert (stats["active"], stats["queue_depth"], stats["max_queue_depth"]) == (1, 2, 2)
+    assert (stats["completed"], stats["failed"]) == (0, 0)
+
+    release.set()
+    assert first.result(5) == "done" and queued[0].result(5) == 1
+    with pytest.raises(ValueError):
+        queued[1].result(5)
+
+    stats = executor.stats()
+    assert (stats["active"], stats["queue_depth"], stats["max_queue_depth"]) == (0, 0, 2)
+    assert (stats["completed"], stats["failed"]) == (3, 1)
+    assert stats["name"] == "test" and stats["max_workers"] == 1
+    assert stats["wait_seconds_total"] > 0 and stats["run_seconds_total"] > 0
+
+
+def test_run_awaits_the_worker_with_the_callers_context(executor):
+    request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+    def work(suffix):
+        return threading.current_thread().name, request_id.get() + suffix
+
+    async def call():
+        request_id.set("req-1")
+        return await executor.run(work, suffix="/a")
+
+    thread_name, value = asyncio.run(call())
+    assert thread_name.startswith("test") and value == "req-1/a"
+
+    async def fail():
+        await executor.run(int, "not a number")
+
+    with pytest.raises(ValueError):
+        asyncio.run(fail())
+    assert executor.stats()["failed"] == 1
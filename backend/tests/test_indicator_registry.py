@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from app.services.indicator_registry import IndicatorRegistry, IndicatorSpec, indicator_registry, normalize_series
+
+
+def test_registry_lookup_and_metadata():
+    assert len(indicator_registry) == 8
+    assert "cpi" in indicator_registry
+    assert indicator_registry.get("missing") is None
+    assert indicator_registry.info("gdp")["name"] == "国内生产总值(GDP)"
+    assert [info["code"] for info in indicator_registry.infos()] == [spec.code for spec in indicator_registry]
+
+
+def test_duplicate_codes_are_rejected():
+    spec = indicator_registry.get("cpi")
+    with pytest.raises(ValueError):
+        IndicatorRegistry([spec, spec])
+
+
+def test_normalize_period_series_drops_invalid_and_future_rows():
+    spec = indicator_registry.get("cpi")
+    raw = pd.DataFrame({
+        "月份": ["2024年01月份", "2099年01月份", "2024年03月份", "bad", "2024年02月份"],
+        "全国-同比增长": [0.1, 9.9, "0.3", 1.0, None],
+    })
+    df = normalize_series(spec, [raw])
+    assert df["date"].tolist() == [pd.Timestamp("2024-03-01"), pd.Timestamp("2024-01-01")]
+    assert df["value"].tolist() == [0.3, 0.1]
+
+
+def test_normalize_uses_transform_and_empty_sources():
+    spec = IndicatorSpec(code="x", name="x", category="", unit="", description="", update_frequency="",
+                         sources=("a", "b"), transform=lambda a, b: a.assign(value=a["value"] + b["value"]))
+    a = pd.DataFrame({"date": ["2024-01-01", "2024-02-01"], "value": [1.0, 2.0]})
+    b = pd.DataFrame({"value": [10.0, 20.0]})
+    assert normalize_series(spec, [a, b])["value"].tolist() == [22.0, 11.0]
+    assert normalize_series(spec, [a, pd.DataFrame()]).empty
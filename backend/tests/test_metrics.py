@@ -0,0 +1,28 @@
+from app.core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, route="/a")
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+
+
+def test_counter_and_callback_use_total_suffix():
+    registry = MetricsRegistry()
+    registry.counter("errors", "Errors.", ["code"]).inc(code='a"b')
+    registry.callback("hits", "Hits.", "counter", lambda: [({}, 7)])
+    registry.callback("depth", "Depth.", "gauge", lambda: [({"pool": "io"}, 2)])
+
+    lines = registry.render().splitlines()
+    assert 'errors_total{code="a\\"b"} 1' in lines
+    assert "hits_total 7" in lines
+    assert 'depth{pool="io"} 2' in lines
+    assert "# TYPE hits counter" in lines
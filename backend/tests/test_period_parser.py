@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from app.services.period_parser import parse_chinese_date, parse_chinese_dates
+
+LABELS = [
+    "2024年第1季度", "2024年第1-2季度", "2023年第1-3季度", "2023年第1-4季度",
+    "2024年04月份", "2024年12月", "2024年4月份", "2024年13月份", "2024年00月份",
+    "2024年第2季度", " 2024年第1季度", "2024 年第1-4季度", "0000年第1季度",
+    "２０２４年第1季度", "2024年03月第1季度", "abc", "", None, np.nan, 2024,
+]
+
+
+def scalar(values):
+    return pd.Series([parse_chinese_date(v) for v in values], dtype="datetime64[ns]")
+
+
+def test_matches_scalar_parser_on_every_format():
+    values = pd.Series(LABELS * 3, dtype=object)
+    pd.testing.assert_series_equal(parse_chinese_dates(values), scalar(values))
+
+
+def test_keeps_index_and_handles_empty_input():
+    values = pd.Series(["2024年第1季度", "2024年05月份"], index=[10, 20])
+    assert parse_chinese_dates(values).tolist() == [pd.Timestamp("2024-03-31"), pd.Timestamp("2024-05-01")]
+    assert parse_chinese_dates(values).index.tolist() == [10, 20]
+    assert parse_chinese_dates(pd.Series([], dtype=object)).empty
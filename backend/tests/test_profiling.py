@@ -0,0 +1,92 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import middleware
+from app.api.middleware import ProfilingMiddleware
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler, current_profile, run_tracked
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_samples_tracked_threads_into_speedscope_profile():
+    profiler = SamplingProfiler(interval=0.001)
+    token = current_profile.set(profiler)
+    profiler.start()
+    try:
+        run_tracked(lambda: busy_wait(0.1))
+    finally:
+        profiler.stop()
+        current_profile.reset(token)
+
+    profile = profiler.to_speedscope("test")
+    frames = [frame["name"] for frame in profile["shared"]["frames"]]
+    assert "busy_wait" in frames
+    samples = profile["profiles"][0]["samples"]
+    assert profiler.sample_count > 0 and len(samples) == len(profile["profiles"][0]["weights"])
+    assert all(0 <= index < len(frames) for stack in samples for index in stack)
+
+
+def test_untracked_work_is_not_sampled():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_wait(0.05)
+    profiler.stop()
+    assert profiler.sample_count == 0
+
+
+class FakeUser:
+    def __init__(self, is_superuser):
+        self.is_active = True
+        self.is_superuser = is_superuser
+
+
+@pytest.fixture
+def profiled_client(tmp_path, monkeypatch):
+    users = {"admin": FakeUser(True), "member": FakeUser(False)}
+
+    def user_from_token(token):
+        if token == "bad":
+            raise HTTPException(status_code=401)
+        return users.get(token)
+
+    monkeypatch.setattr(middleware, "user_from_token", user_from_token)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/work")
+    def work():
+        busy_wait(0.02)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer member", "Bearer bad", "Basic admin"])
+def test_profiling_is_refused_without_a_superuser(profiled_client, tmp_path, authorization):
+    headers = {"X-Profile": "1", **({"Authorization": authorization} if authorization else {})}
+    response = profiled_client.get("/work", headers=headers)
+    assert response.status_code == 200 and response.json() == {"ok": True}
+    assert "x-profile-path" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_superuser_request_is_profiled(profiled_client, tmp_path):
+    response = profiled_client.get("/work", params={"profile": "1"}, headers={"Authorization": "Bearer admin"})
+    assert response.status_code == 200 and response.json() == {"ok": True}
+    path = Path(response.headers["x-profile-path"])
+    assert path.parent == tmp_path.resolve() and path.exists()
+    assert json.loads(path.read_bytes())["profiles"][0]["name"] == "GET /work"
+
+    # Without the opt-in header or parameter, even superusers are not profiled.
+    assert "x-profile-path" not in profiled_client.get("/work", headers={"Authorization": "Bearer admin"}).headers
@@ -0,0 +1,50 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services.refresh_scheduler import RefreshScheduler
+
+INTERVAL = 6 * 60 * 60
+
+
+class FakeStorage:
+    def __init__(self, fetched):
+        self.fetched = fetched
+
+    def fetched_at(self, code):
+        return self.fetched.get(code)
+
+
+class FakeFetcher:
+    def __init__(self, stored, loaded=None):
+        self.storage = FakeStorage(stored)
+        self.loaded = loaded or {}
+
+    def fetched_at(self, code):
+        return self.loaded.get(code)
+
+
+def first_delay(fetcher, code="cpi"):
+    scheduler = RefreshScheduler(fetcher)
+    scheduler._status[code] = {"interval_seconds": INTERVAL, "consecutive_failures": 0}
+    return asyncio.run(scheduler._first_delay(code))
+
+
+def test_recent_fetch_waits_for_its_interval_after_restart():
+    fetched = datetime.now() - timedelta(hours=2)
+    delay = first_delay(FakeFetcher({"cpi": fetched}))
+    assert INTERVAL - 2 * 3600 - 5 <= delay <= INTERVAL - 2 * 3600 + settings.refresh_initial_delay
+
+
+def test_in_memory_fetch_time_takes_precedence():
+    stored = datetime.now() - timedelta(days=1)
+    loaded = datetime.now() - timedelta(hours=1)
+    delay = first_delay(FakeFetcher({"cpi": stored}, {"cpi": loaded}))
+    assert delay >= INTERVAL - 3600 - 5
+
+
+@pytest.mark.parametrize("stored", [{}, {"cpi": datetime.now() - timedelta(days=1)}])
+def test_never_fetched_or_overdue_refreshes_within_initial_delay(stored):
+    assert 0 <= first_delay(FakeFetcher(stored)) <= settings.refresh_initial_delay
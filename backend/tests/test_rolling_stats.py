@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicator_calculator as calculator_module
+from app.services.data_fetcher import DataFetcher
+from app.services.indicator_calculator import IndicatorCalculator, format_date
+from app.services import rolling_stats as rolling_stats_module
+from app.services.cache_storage import NumpyCacheStorage
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    fetcher = DataFetcher(cache_dir=str(tmp_path), storage=NumpyCacheStorage(tmp_path))
+    monkeypatch.setattr(calculator_module, "data_fetcher", fetcher)
+    return fetcher
+
+
+def make_series(n, seed=0):
+    dates = pd.date_range(end="2024-06-30", periods=n, freq="D")[::-1]
+    values = 3.0 + np.cumsum(np.random.default_rng(seed).normal(0, 0.5, n))
+    return pd.DataFrame({"date": dates, "value": values})
+
+
+def batch_trend(calculator, code, df):
+    values = df["value"].tolist()
+    return {
+        "indicator_code": code,
+        "trend": calculator.analyze_trend(values),
+        "change_percent": calculator.calculate_change_percent(values),
+        "ma_7": calculator.calculate_ma(values, 7),
+        "ma_30": calculator.calculate_ma(values, 30),
+        "prediction": calculator.simple_prediction(values),
+        "volatility": calculator.calculate_volatility(values),
+        "latest_value": values[0],
+        "latest_date": format_date(df["date"].iloc[0]),
+    }
+
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert_same(actual[key], value)
+        elif isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+        else:
+            assert actual[key] == value
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 9, 10, 29, 30, 31, 500])
+def test_stats_match_batch_methods(n):
+    calculator = IndicatorCalculator()
+    df = make_series(n, seed=n)
+    assert_same(calculator.trend_from_frame("cpi", df), batch_trend(calculator, "cpi", df))
+
+
+def refresh(fetcher, df):
+    fetcher.fetch_source_data = lambda code: df
+    return fetcher.fetch_indicator_data("cpi", force_update=True)
+
+
+@pytest.fixture
+def from_frame_calls(monkeypatch):
+    calls = []
+    from_frame = rolling_stats_module.RollingStats.from_frame
+
+    def counting(df):
+        calls.append(len(df))
+        return from_frame(df)
+
+    monkeypatch.setattr(rolling_stats_module.RollingStats, "from_frame", counting)
+    return calls
+
+
+@pytest.mark.parametrize("n", [3, 25, 200])
+def test_appended_points_update_incrementally(fetcher, from_frame_calls, n):
+    calculator = IndicatorCalculator()
+    fetcher.add_listener(calculator.on_series_updated)
+    full = make_series(n + 8, seed=n)
+    previous = full.iloc[8:].reset_index(drop=True)
+    calculator.trend_from_frame("cpi", refresh(fetcher, previous))
+
+    refresh(fetcher, full)
+    version, stats = calculator._stats["cpi"]
+    assert version == fetcher.series_version("cpi") and stats.count == n + 8
+    assert calculator.rolling_stats("cpi", full) is stats
+    assert from_frame_calls == [n]
+    assert_same(calculator.trend_from_stats("cpi", stats), batch_trend(calculator, "cpi", full))
+
+
+def test_interior_change_is_not_served_stale_stats(fetcher):
+    calculator = IndicatorCalculator()
+    df = make_series(40)
+    fetcher._remember("cpi", df)
+    calculator.trend_from_frame("cpi", df)
+
+    # Same length and endpoints, different interior values.
+    changed = df.copy()
+    changed.loc[20, "value"] += 5.0
+    fetcher._remember("cpi", changed)
+    assert_same(calculator.trend_from_frame("cpi", changed), batch_trend(calculator, "cpi", changed))
+
+
+def test_revision_alongside_an_append_rebuilds(fetcher):
+    calculator = IndicatorCalculator()
+    fetcher.add_listener(calculator.on_series_updated)
+    full = make_series(51)
+    previous = full.iloc[1:].reset_index(drop=True)
+    calculator.trend_from_frame("cpi", refresh(fetcher, previous))
+
+    revised = full.copy()
+    revised.loc[20, "value"] += 1.0
+    refresh(fetcher, revised)
+    assert "cpi" not in calculator._stats
+    assert_same(calculator.get_indicator_trend("cpi"), batch_trend(calculator, "cpi", revised))
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from app.services.data_fetcher import SeriesUpdate, data_fetcher, series_version
+from app.services.indicator_calculator import IndicatorCalculator
+
+
+def make_series(n, offset=0.0):
+    dates = pd.date_range(end="2024-06-30", periods=n, freq="D")[::-1]
+    return pd.DataFrame({"date": dates, "value": np.linspace(1.0, 2.0, n) + offset})
+
+
+def test_trend_is_memoized_per_series_version(monkeypatch):
+    calculator = IndicatorCalculator()
+    computed = []
+    trend_from_frame = calculator.trend_from_frame
+
+    def counting(code, df):
+        computed.append(code)
+        return trend_from_frame(code, df)
+
+    monkeypatch.setattr(calculator, "trend_from_frame", counting)
+    data_fetcher._remember("memo_test", make_series(40))
+
+    first = calculator.get_indicator_trend("memo_test")
+    assert calculator.get_indicator_trend("memo_test") is first
+    assert computed == ["memo_test"]
+
+    # New content means a new version; the listener also drops the old entry.
+    previous, updated = data_fetcher._peek_frame("memo_test"), make_series(41, offset=1.0)
+    data_fetcher._remember("memo_test", updated)
+    update = SeriesUpdate(series_version(previous), data_fetcher.series_version("memo_test"), None)
+    calculator.on_series_updated("memo_test", previous, updated, update)
+    second = calculator.get_indicator_trend("memo_test")
+    assert computed == ["memo_test", "memo_test"]
+    assert second["latest_value"] == updated["value"].iloc[0]
+    assert second["latest_date"] == "2024-06-30"
+    data_fetcher.invalidate("memo_test")
@@ -4,10 +4,13 @@ import type {
   LoginResponse, 
   Indicator, 
   IndicatorData, 
+  IndicatorColumnarData,
   IndicatorSummary,
+  IndicatorAnalytics,
   TrendAnalysis,
   Alert,
-  CreateAlertRequest
+  CreateAlertRequest,
+  AlertTrigger
 } from '../types';
 
 const api = axios.create({
@@ -37,9 +40,15 @@ export const indicatorApi = {
   getIndicatorData: (code: string, forceUpdate = false) => 
     api.get<IndicatorData>(`/api/indicators/${code}/data`, { params: { force_update: forceUpdate } }),
   
+  getIndicatorSeries: (code: string, forceUpdate = false) =>
+    api.get<IndicatorColumnarData>(`/api/indicators/${code}/data`, { params: { force_update: forceUpdate, format: 'columnar' } }),
+  
   compareIndicators: (codes: string[], startDate?: string, endDate?: string) =>
     api.post('/api/indicators/compare', { codes, start_date: startDate, end_date: endDate }),
   
+  getAnalytics: (codes: string[], startDate?: string, endDate?: string, freq = 'M') =>
+    api.post<IndicatorAnalytics>('/api/indicators/analytics', { codes, start_date: startDate, end_date: endDate, freq }),
+  
   getTrend: (code: string) => 
     api.get<TrendAnalysis>(`/api/indicators/${code}/trend`),
   
@@ -54,8 +63,8 @@ export const alertApi = {
   getAlerts: (skip = 0, limit = 100) =>
     api.get<{ total: number; items: Alert[] }>('/api/alerts', { params: { skip, limit } }),
   
-  checkAlerts: () =>
-    api.get('/api/alerts/check'),
+  checkAlerts: (since?: string) =>
+    api.get<AlertTrigger[]>('/api/alerts/check', { params: { since } }),
   
   updateAlert: (id: number, data: Partial<CreateAlertRequest & { is_active: boolean }>) =>
     api.put<Alert>(`/api/alerts/${id}`, data),
@@ -64,4 +73,13 @@ export const alertApi = {
     api.delete(`/api/alerts/${id}`),
 };
 
+export const streamApi = {
+  // Server-sent events: 'indicator_updated' and, when logged in, 'alert_triggered'.
+  open: () => {
+    const token = localStorage.getItem('token');
+    const query = token ? `?token=${encodeURIComponent(token)}` : '';
+    return new EventSource(`${api.defaults.baseURL}/api/stream${query}`);
+  },
+};
+
 export default api;
@@ -1,7 +1,7 @@
 import { defineStore } from 'pinia';
 import { ref, computed } from 'vue';
-import { authApi, indicatorApi, alertApi } from '../api';
-import type { User, IndicatorSummary, IndicatorData, TrendAnalysis, Alert } from '../types';
+import { authApi, indicatorApi, alertApi, streamApi } from '../api';
+import type { User, IndicatorSummary, IndicatorData, TrendAnalysis, Alert, AlertTrigger } from '../types';
 
 export const useUserStore = defineStore('user', () => {
   const token = ref<string | null>(localStorage.getItem('token'));
@@ -78,7 +78,17 @@ export const useIndicatorStore = defineStore('indicator', () => {
     }
   };
 
-  return { summary, currentData, trend, loading, error, fetchSummary, fetchIndicatorData, fetchTrend };
+  // Refreshes the summary when the server pushes an indicator update;
+  // returns a function that closes the stream.
+  const watchUpdates = () => {
+    const source = streamApi.open();
+    source.addEventListener('indicator_updated', () => {
+      fetchSummary();
+    });
+    return () => source.close();
+  };
+
+  return { summary, currentData, trend, loading, error, fetchSummary, fetchIndicatorData, fetchTrend, watchUpdates };
 });
 
 export const useAlertStore = defineStore('alert', () => {
@@ -106,9 +116,32 @@ export const useAlertStore = defineStore('alert', () => {
     alerts.value = alerts.value.filter(a => a.id !== id);
   };
 
+  // Newest event already shown; later checks only return events after it.
+  const lastTriggeredAt = ref<string | undefined>();
+
   const checkAlerts = async () => {
-    return await alertApi.checkAlerts();
+    const res = await alertApi.checkAlerts(lastTriggeredAt.value);
+    const events: AlertTrigger[] = res.data;
+    if (events.length > 0) {
+      lastTriggeredAt.value = events[0].triggered_at;
+    }
+    return events;
+  };
+
+  // Pushed 'alert_triggered' events carry no event id, so fetch the new
+  // events (with ids) before handing them on; returns a function that
+  // closes the stream.
+  const watchTriggered = (onTriggered: (events: AlertTrigger[]) => void) => {
+    const source = streamApi.open();
+    source.addEventListener('alert_triggered', async () => {
+      const events = await checkAlerts();
+      if (events.length > 0) {
+        onTriggered(events);
+        fetchAlerts();
+      }
+    });
+    return () => source.close();
   };
 
-  return { alerts, loading, fetchAlerts, createAlert, deleteAlert, checkAlerts };
+  return { alerts, loading, fetchAlerts, createAlert, deleteAlert, checkAlerts, watchTriggered };
 });
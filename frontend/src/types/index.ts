@@ -40,6 +40,14 @@ export interface IndicatorData {
   data: IndicatorDataPoint[];
   latest_value?: number;
   change_percent?: number;
+  fetched_at?: string;
+  age_seconds?: number;
+  is_stale?: boolean;
+}
+
+export interface IndicatorColumnarData extends Omit<IndicatorData, 'data'> {
+  dates: number[];
+  values: number[];
 }
 
 export interface IndicatorSummary {
@@ -51,6 +59,25 @@ export interface IndicatorSummary {
   unit?: string;
 }
 
+export interface IndicatorAnalytics {
+  codes: string[];
+  freq: string;
+  method: string;
+  observations: number;
+  start?: string;
+  end?: string;
+  correlation: (number | null)[][];
+  lagged: {
+    lags: number[];
+    pairs: { x: string; y: string; values: (number | null)[]; best?: { lag: number; value: number } }[];
+  };
+  rolling: {
+    window: number;
+    periods: string[];
+    pairs: { x: string; y: string; values: (number | null)[] }[];
+  };
+}
+
 export interface TrendAnalysis {
   indicator_code: string;
   trend: string;
@@ -75,6 +102,17 @@ export interface Alert {
   created_at: string;
 }
 
+export interface AlertTrigger {
+  id: number;
+  alert_id: number;
+  indicator_code: string;
+  current_value: number;
+  condition: string;
+  threshold: number;
+  data_date?: string;
+  triggered_at: string;
+}
+
 export interface CreateAlertRequest {
   indicator_code: string;
   condition: string;